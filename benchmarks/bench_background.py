@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import cairo
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import ArtworkPipeline
+
+
+def legacy_background(image_data, target_width=520, target_height=810):
+    pil_image = Image.open(io.BytesIO(image_data))
+    if pil_image.mode != 'RGB':
+        pil_image = pil_image.convert('RGB')
+
+    img_ratio = pil_image.width / pil_image.height
+    target_ratio = target_width / target_height
+
+    if img_ratio > target_ratio:
+        new_height = pil_image.height
+        new_width = int(new_height * target_ratio)
+        left = (pil_image.width - new_width) // 2
+        pil_image = pil_image.crop((left, 0, left + new_width, new_height))
+    else:
+        new_width = pil_image.width
+        new_height = int(new_width / target_ratio)
+        top = (pil_image.height - new_height) // 3
+        pil_image = pil_image.crop((0, top, new_width, top + new_height))
+
+    pil_image = pil_image.resize((target_width, target_height), Image.LANCZOS)
+    pil_image = pil_image.filter(ImageFilter.GaussianBlur(radius=15))
+    pil_image = ImageEnhance.Brightness(pil_image).enhance(0.7)
+
+    width, height = pil_image.size
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, width, height)
+    img_array = np.array(pil_image)
+    buf_array = np.ndarray(shape=(height, width, 4), dtype=np.uint8, buffer=surface.get_data())
+    buf_array[:, :, 0] = img_array[:, :, 2]
+    buf_array[:, :, 1] = img_array[:, :, 1]
+    buf_array[:, :, 2] = img_array[:, :, 0]
+    buf_array[:, :, 3] = 255
+    surface.mark_dirty()
+    return surface, pil_image
+
+
+def fast_background(pipeline, image_data):
+    image = pipeline.decode(image_data)
+    background = pipeline.create_background(image)
+    return pipeline.surface_from_image(background), background
+
+
+def make_cover(size):
+    rng = np.random.default_rng(size)
+    y, x = np.mgrid[0:size, 0:size] / size
+    image = np.stack([x, y, (x + y) / 2], axis=2) + rng.normal(0, 0.05, (size, size, 3))
+    buffer = io.BytesIO()
+    Image.fromarray((np.clip(image, 0, 1) * 255).astype(np.uint8)).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Blurred background generation benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pipeline = ArtworkPipeline()
+
+    print(f"{'cover':<14} {'before ms':>10} {'after ms':>9} {'speedup':>8} {'mean abs diff':>14}")
+    for name, size in [('small', 300), ('medium', 1000), ('huge', 3000)]:
+        data = make_cover(size)
+        before_ms, (_, before_image) = timed(lambda: legacy_background(data), args.repeat)
+        after_ms, (_, after_image) = timed(lambda: fast_background(pipeline, data), args.repeat)
+        diff = np.abs(np.asarray(before_image, dtype=np.int16) - np.asarray(after_image, dtype=np.int16)).mean()
+        print(f"{name + f' {size}px':<14} {before_ms:>10.1f} {after_ms:>9.1f} {before_ms / after_ms:>7.1f}x {diff:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
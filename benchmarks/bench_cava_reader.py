@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import CavaVisualizer
+
+
+def make_frames(bars, count):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 65535, size=(count, bars), dtype=np.uint16)
+
+
+def ascii_stream(frames, max_range):
+    scaled = (frames.astype(np.float64) * max_range / 65535).astype(int)
+    lines = [';'.join(str(v) for v in row) + ';\n' for row in scaled]
+    return io.BytesIO(''.join(lines).encode())
+
+
+def binary_stream(frames):
+    return io.BytesIO(frames.tobytes())
+
+
+def legacy_read(visualizer, stream):
+    buffer = ""
+    while True:
+        char = stream.read(1).decode('utf-8')
+        if not char:
+            return
+        buffer += char
+        if '\n' in buffer:
+            lines = buffer.split('\n')
+            buffer = lines[-1]
+            for line in lines[:-1]:
+                if line.strip():
+                    raw_values = [float(x) for x in line.strip().split(';') if x.strip()]
+                    if len(raw_values) == visualizer.bars:
+                        visualizer._process_frame(raw_values)
+
+
+def measure(name, data_format, stream, bars, count, reader=None):
+    visualizer = CavaVisualizer(data_format=data_format, bars=bars)
+
+    start = time.process_time()
+    if reader:
+        reader(visualizer, stream)
+    elif data_format == 'binary':
+        visualizer._read_binary(stream)
+    else:
+        visualizer._read_ascii(stream)
+    elapsed = time.process_time() - start
+
+    per_thousand = elapsed / count * 1000
+    print(f"{name:<24} {per_thousand * 1000:10.2f} ms CPU / 1000 frames")
+    return per_thousand
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare CPU cost of cava stream readers')
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--bars', type=int, default=100)
+    args = parser.parse_args()
+
+    frames = make_frames(args.bars, args.frames)
+    max_range = CavaVisualizer().max_range
+
+    print(f"{args.frames} frames, {args.bars} bars")
+    legacy = measure('ascii (byte-by-byte)', 'ascii', ascii_stream(frames, max_range), args.bars, args.frames, legacy_read)
+    ascii_chunked = measure('ascii (chunked)', 'ascii', ascii_stream(frames, max_range), args.bars, args.frames)
+    binary = measure('binary (readinto)', 'binary', binary_stream(frames), args.bars, args.frames)
+
+    print(f"binary vs byte-by-byte: {legacy / binary:.1f}x, binary vs chunked ascii: {ascii_chunked / binary:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
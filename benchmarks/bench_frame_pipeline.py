@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import FramePipeline
+
+
+def legacy_process(state, raw_values, smoothing_factor=0.7):
+    normalized_points = [math.sqrt(i / 700.0) for i in raw_values]
+    prev_points = state.get('prev_points')
+    if prev_points is not None:
+        smoothed_points = []
+        for i, point in enumerate(normalized_points):
+            smoothed_points.append(prev_points[i] * smoothing_factor + point * (1 - smoothing_factor))
+        state['prev_points'] = smoothed_points
+    else:
+        state['prev_points'] = normalized_points
+    return state['prev_points'].copy()
+
+
+def measure(process, frames):
+    start = time.process_time()
+    for frame in frames:
+        process(frame)
+    return (time.process_time() - start) / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-frame cost of visualizer normalization and smoothing')
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--bars', type=int, nargs='+', default=[100, 256, 512])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'bars':>6} {'legacy':>12} {'pipeline':>12} {'all stages':>12}   (us / frame)")
+    for bars in args.bars:
+        frames = rng.integers(0, 1000, size=(args.frames, bars)).astype(np.float32)
+        frame_lists = frames.tolist()
+
+        state = {}
+        legacy = measure(lambda f: legacy_process(state, f), frame_lists)
+
+        pipeline = FramePipeline(bars)
+        vectorized = measure(pipeline.process, frames)
+
+        full = FramePipeline(bars, peak_hold=True, auto_gain=True, gravity=True)
+        all_stages = measure(full.process, frames)
+
+        print(f"{bars:>6} {legacy:>12.1f} {vectorized:>12.1f} {all_stages:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
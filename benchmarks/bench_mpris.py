@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fake_mpris_player import spawn_player, start_private_bus
+
+
+def total_calls(controller):
+    return sum(stats['calls'] + stats['pending'] for stats in controller.latency_stats().values())
+
+
+def run_loop(seconds, on_tick=None, until=None):
+    from gi.repository import GLib
+
+    context = GLib.MainContext.default()
+    interval = 0.1
+    started = last = next_tick = time.monotonic()
+    worst_stall = 0.0
+
+    while time.monotonic() - started < seconds:
+        context.iteration(False)
+        now = time.monotonic()
+        worst_stall = max(worst_stall, now - last)
+        last = now
+        if until and until():
+            break
+        if on_tick and now >= next_tick:
+            on_tick()
+            next_tick += interval
+        time.sleep(0.001)
+
+    return worst_stall * 1000
+
+
+def ready_players(controller):
+    return sum(1 for handle in controller.players.values() if handle.seeded)
+
+
+def wait_for_players(controller, count, timeout=10.0):
+    started = time.monotonic()
+    run_loop(timeout, until=lambda: ready_players(controller) >= count)
+    return (time.monotonic() - started) * 1000
+
+
+def bench_idle(controller, seconds):
+    results = {}
+    for status in ['Playing', 'Paused']:
+        handle = controller.current_handle()
+        if handle.state.get('PlaybackStatus') != status:
+            controller.play_pause()
+            run_loop(2.0, until=lambda: handle.state.get('PlaybackStatus') == status)
+
+        run_loop(0.5, on_tick=controller.get_current_track_info)
+        before = total_calls(controller)
+        stall = run_loop(seconds, on_tick=controller.get_current_track_info)
+        results[status.lower()] = {
+            'messages_per_second': (total_calls(controller) - before) / seconds,
+            'worst_stall_ms': stall
+        }
+    return results
+
+
+def check_properties(controller):
+    handle = controller.current_handle()
+    values = {'Volume': 0.25, 'Shuffle': True, 'LoopStatus': 'Playlist'}
+    results = {}
+    for name, value in values.items():
+        errors = handle.latency['errors']
+        if name == 'Volume':
+            sent = controller.set_volume(value)
+        else:
+            sent = controller.set_player_property(name, value)
+        run_loop(2.0, until=lambda: handle.latency['pending'] == 0)
+        results[name] = sent and handle.latency['errors'] == errors and handle.state.get(name) == value
+    return results
+
+
+def bench_action_latency(controller, iterations):
+    samples = []
+    for _ in range(iterations):
+        title = controller.get_current_track_info()['title']
+        started = time.monotonic()
+        controller.next_track()
+        run_loop(2.0, until=lambda: controller.get_current_track_info()['title'] != title)
+        samples.append((time.monotonic() - started) * 1000)
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1],
+        'max_ms': samples[-1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MediaController against stand-in MPRIS players")
+    parser.add_argument('--seconds', type=float, default=5.0, help="length of each idle measurement")
+    parser.add_argument('--iterations', type=int, default=50, help="Next calls for the action latency test")
+    parser.add_argument('--players', type=int, default=20, help="players on the bus for the crowded test")
+    parser.add_argument('--storm', type=float, default=500.0, help="signals per second from one crowded player")
+    parser.add_argument('--latency', type=float, default=0.0, help="injected per-call player latency in seconds")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    daemon, address = start_private_bus()
+    processes = [spawn_player('bench', '--latency', str(args.latency))]
+
+    try:
+        from ecliptic import Config, MediaController
+
+        controller = MediaController(Config())
+        results = {'bus': address, 'player_latency_s': args.latency}
+        results['discovery_ms'] = wait_for_players(controller, 1)
+        results['properties'] = check_properties(controller)
+        results['idle'] = bench_idle(controller, args.seconds)
+        if controller.current_handle().state.get('PlaybackStatus') != 'Playing':
+            controller.play_pause()
+        results['action_to_ui'] = bench_action_latency(controller, args.iterations)
+
+        for i in range(1, args.players):
+            options = ['--storm', str(args.storm), '--storm-properties', 'Volume,Seeked,Metadata'] if i == 1 else []
+            processes.append(spawn_player(f'crowd{i}', *options))
+
+        crowded = {'players': args.players, 'storm_signals_per_second': args.storm}
+        crowded['discovery_ms'] = wait_for_players(controller, args.players)
+        crowded['players_ready'] = ready_players(controller)
+        cpu_started = time.process_time()
+        before = total_calls(controller)
+        crowded['worst_stall_ms'] = run_loop(args.seconds, on_tick=controller.get_current_track_info)
+        crowded['messages_per_second'] = (total_calls(controller) - before) / args.seconds
+        crowded['cpu_percent'] = (time.process_time() - cpu_started) / args.seconds * 100
+        results['crowded'] = crowded
+    finally:
+        for process in processes:
+            process.terminate()
+        daemon.terminate()
+
+    status = 0 if all(results['properties'].values()) else 1
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return status
+
+    print("property writes: " + ", ".join(
+        f"{name} {'ok' if ok else 'FAILED'}" for name, ok in results['properties'].items()))
+    for status, idle in results['idle'].items():
+        print(f"idle ({status}): {idle['messages_per_second']:.2f} D-Bus calls/s, "
+              f"worst stall {idle['worst_stall_ms']:.1f} ms")
+    action = results['action_to_ui']
+    print(f"Next -> UI update: median {action['median_ms']:.1f} ms, p95 {action['p95_ms']:.1f} ms, "
+          f"max {action['max_ms']:.1f} ms over {action['iterations']} skips")
+    print(f"{crowded['players_ready']}/{crowded['players']} players ready in {crowded['discovery_ms']:.0f} ms, "
+          f"{crowded['messages_per_second']:.2f} calls/s, {crowded['cpu_percent']:.1f}% CPU, "
+          f"worst stall {crowded['worst_stall_ms']:.1f} ms during a {args.storm:.0f}/s signal storm")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
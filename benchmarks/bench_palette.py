@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import ColorExtractor
+
+
+def legacy_colors(data, num_colors=3):
+    image = Image.open(io.BytesIO(data))
+    image = image.resize((150, 150))
+    image = image.convert('RGB')
+    colors = image.getcolors(maxcolors=256*256*256)
+    colors.sort(key=lambda x: x[0], reverse=True)
+    return [tuple(c / 255.0 for c in color) for count, color in colors[:num_colors]]
+
+
+def synthetic_covers():
+    rng = np.random.default_rng(0)
+    covers = []
+    for size in [300, 640, 1400, 3000]:
+        y, x = np.mgrid[0:size, 0:size] / size
+        base = rng.random(3)
+        image = np.stack([
+            (base[0] + 0.5 * x) % 1.0,
+            (base[1] + 0.4 * y) % 1.0,
+            (base[2] + 0.3 * x * y) % 1.0
+        ], axis=2)
+        image += rng.normal(0, 0.03, image.shape)
+        pil_image = Image.fromarray((np.clip(image, 0, 1) * 255).astype(np.uint8))
+        pil_image = pil_image.filter(ImageFilter.GaussianBlur(2))
+        buffer = io.BytesIO()
+        pil_image.save(buffer, format='JPEG', quality=90)
+        covers.append((f"synthetic {size}x{size}", buffer.getvalue()))
+    return covers
+
+
+def load_corpus(directory):
+    covers = []
+    for pattern in ('*.jpg', '*.jpeg', '*.png', '*.webp'):
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            with open(path, 'rb') as f:
+                covers.append((os.path.basename(path), f.read()))
+    return covers
+
+
+def spread(colors):
+    colors = np.array(colors)
+    distances = [np.linalg.norm(a - b) for i, a in enumerate(colors) for b in colors[i + 1:]]
+    return min(distances) if distances else 0.0
+
+
+def timed(func, data, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(data)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Album art palette extraction benchmark')
+    parser.add_argument('corpus', nargs='?', help='Directory of cover images (default: synthetic covers)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    covers = load_corpus(args.corpus) if args.corpus else synthetic_covers()
+
+    print(f"{'cover':<28} {'legacy ms':>10} {'new ms':>8} {'legacy spread':>14} {'new spread':>11}")
+    for name, data in covers:
+        legacy_ms, legacy = timed(legacy_colors, data, args.repeat)
+        new_ms, new = timed(lambda d: ColorExtractor.get_dominant_colors(io.BytesIO(d)), data, args.repeat)
+        print(f"{name[:28]:<28} {legacy_ms:>10.1f} {new_ms:>8.1f} {spread(legacy):>14.3f} {spread(new):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
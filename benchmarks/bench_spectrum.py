@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import SpectrumAnalyzer
+
+
+def write_tone(path, frequency, seconds=2.0, sample_rate=44100):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (np.sin(2 * np.pi * frequency * t) * 0.5 * 32767).astype(np.int16)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+
+def analyze(analyzer, path):
+    start = time.process_time()
+    frames = analyzer.analyze_wav(path)
+    elapsed = time.process_time() - start
+    return frames, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the built-in spectrum analyzer over WAV files')
+    parser.add_argument('files', nargs='*', help='16-bit 44.1 kHz WAV files (default: generated test tones)')
+    parser.add_argument('--bars', type=int, default=100)
+    args = parser.parse_args()
+
+    analyzer = SpectrumAnalyzer(bars=args.bars)
+
+    if args.files:
+        for path in args.files:
+            frames, elapsed = analyze(analyzer, path)
+            print(f"{os.path.basename(path)}: {len(frames)} frames, "
+                  f"{elapsed / max(len(frames), 1) * 1e6:.1f} us CPU / frame")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        previous_band = -1
+        for frequency in [100, 440, 1000, 4000, 10000]:
+            path = os.path.join(tmp, f"tone_{frequency}.wav")
+            write_tone(path, frequency)
+            frames, elapsed = analyze(analyzer, path)
+            band = int(np.argmax(frames[-1]))
+            order = 'ok' if band > previous_band else 'OUT OF ORDER'
+            previous_band = band
+            print(f"{frequency:>6} Hz -> band {band:>3}  {order:<12} "
+                  f"{elapsed / len(frames) * 1e6:8.1f} us CPU / frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import time
+
+import cairo
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import VisualizerRenderer
+
+
+def legacy_draw(renderer, cr, width, height, values):
+    ls = len(values)
+    points = []
+
+    x = 0
+    y = (1.0 - values[0]) * height
+    points.extend([x, y])
+
+    for i in range(ls - 1):
+        x1 = (i + 1) * width / (ls - 1)
+        y1 = (1.0 - values[i + 1]) * height
+
+        if i < ls - 2:
+            x_mid = i * width / (ls - 1) + width / (ls - 1) * 0.5
+            y_mid = (y + y1) * 0.5
+            points.extend([x_mid, y_mid, x1, y1])
+        else:
+            points.extend([x1, y1])
+
+        x, y = x1, y1
+
+    segments = 30
+    for i in range(segments):
+        alpha = i / segments
+        color = renderer.interpolate_color(renderer.colors, alpha)
+
+        scaled_points = []
+        for j in range(0, len(points), 2):
+            x = points[j]
+            y = points[j + 1]
+            scaled_y = y + (height - y) * alpha * 0.3
+            scaled_points.extend([x, scaled_y])
+
+        scaled_points.extend([width, height, 0, height])
+
+        cr.set_source_rgba(color[0], color[1], color[2], 0.6 - alpha * 0.4)
+        cr.new_path()
+        cr.move_to(scaled_points[0], scaled_points[1])
+        for k in range(2, len(scaled_points), 2):
+            cr.line_to(scaled_points[k], scaled_points[k + 1])
+        cr.close_path()
+        cr.fill()
+
+    main_color = renderer.interpolate_color(renderer.colors, 0.5)
+    cr.set_source_rgba(main_color[0], main_color[1], main_color[2], 0.9)
+    cr.set_line_width(2)
+    cr.new_path()
+    cr.move_to(points[0], points[1])
+    for i in range(2, len(points), 2):
+        cr.line_to(points[i], points[i + 1])
+    cr.stroke()
+
+
+def measure(draw, frames, width, height):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    cr = cairo.Context(surface)
+
+    start = time.perf_counter()
+    for frame in frames:
+        cr.set_operator(cairo.OPERATOR_CLEAR)
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
+        draw(cr, width, height, frame)
+    surface.flush()
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless VisualizerWidget drawing benchmark')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--bars', type=int, default=100)
+    parser.add_argument('--width', type=int, default=400)
+    parser.add_argument('--height', type=int, default=80)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = rng.random((args.frames, args.bars), dtype=np.float32) * 0.9
+
+    renderer = VisualizerRenderer()
+    before = measure(lambda cr, w, h, f: legacy_draw(renderer, cr, w, h, f.tolist()), frames, args.width, args.height)
+    after = measure(renderer.draw, frames, args.width, args.height)
+
+    print(f"{args.width}x{args.height}, {args.bars} bars")
+    print(f"before: {before:8.1f} fps")
+    print(f"after:  {after:8.1f} fps ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import ArtworkFetcher, ArtworkFetchError
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.active = 0
+        self.max_active = 0
+        self.connections = set()
+
+    def url(self, path):
+        host, port = self.server_address
+        return f"http://{host}:{port}{path}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.connections.add(self.client_address)
+
+        try:
+            if self.path == '/stall':
+                self.send_response(200)
+                self.send_header('Content-Length', str(1024 * 1024))
+                self.end_headers()
+                for _ in range(100):
+                    self.wfile.write(b'\0' * 1024)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+                return
+
+            if self.path == '/huge':
+                body = b'\0' * (4 * 1024 * 1024)
+            else:
+                time.sleep(server.delay)
+                body = self.path.encode() * 1000
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def check(name, ok, detail):
+    print(f"{'ok  ' if ok else 'FAIL'} {name:<22} {detail}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise ArtworkFetcher against a local stand-in HTTP server")
+    parser.add_argument('--callers', type=int, default=8, help="concurrent callers per scenario")
+    parser.add_argument('--per-host', type=int, default=2, help="per-host concurrency cap")
+    parser.add_argument('--delay', type=float, default=0.2, help="server response delay in seconds")
+    args = parser.parse_args()
+
+    server = StandInServer(args.delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fetcher = ArtworkFetcher(max_per_host=args.per_host, deadline=2.0, max_bytes=1024 * 1024)
+    results = []
+
+    contents = []
+    run_threads(args.callers, lambda i: contents.append(fetcher.get(server.url('/same.jpg'))['content']))
+    results.append(check(
+        "coalescing", server.hits.get('/same.jpg') == 1 and len(set(contents)) == 1,
+        f"{args.callers} callers, {server.hits.get('/same.jpg')} server hit(s), {fetcher.stats()['coalesced']} coalesced"
+    ))
+
+    started = time.perf_counter()
+    run_threads(args.callers, lambda i: fetcher.get(server.url(f'/cover-{i}.jpg')))
+    elapsed = time.perf_counter() - started
+    results.append(check(
+        "per-host cap", server.max_active <= args.per_host,
+        f"max {server.max_active} concurrent (cap {args.per_host}), {elapsed * 1000:.0f} ms for {args.callers} covers"
+    ))
+
+    results.append(check(
+        "keep-alive", len(server.connections) <= args.per_host,
+        f"{len(server.connections)} connection(s) for {sum(server.hits.values())} requests"
+    ))
+
+    try:
+        fetcher.get(server.url('/huge'))
+        results.append(check("max size", False, "4 MB response accepted"))
+    except ArtworkFetchError as e:
+        results.append(check("max size", True, str(e)))
+
+    started = time.perf_counter()
+    try:
+        fetcher.get(server.url('/stall'))
+        results.append(check("deadline", False, "stalled response completed"))
+    except ArtworkFetchError as e:
+        elapsed = time.perf_counter() - started
+        results.append(check("deadline", elapsed < fetcher.deadline + 1, f"gave up after {elapsed:.1f}s"))
+
+    server.shutdown()
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
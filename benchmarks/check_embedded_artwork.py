@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+temp_dir = tempfile.mkdtemp(prefix='ecliptic-tmpcheck-')
+tempfile.tempdir = temp_dir
+
+from mutagen.flac import FLAC, Picture
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import ArtworkPipeline, LocalMusicPlayer
+
+
+def write_flac(path, cover):
+    sample_rate, channels, bits, total_samples = 44100, 2, 16, 44100 * 180
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | ((bits - 1) << 36) | total_samples
+    streaminfo = struct.pack('>HH', 4096, 4096) + b'\0' * 6 + packed.to_bytes(8, 'big') + b'\0' * 16
+    with open(path, 'wb') as f:
+        f.write(b'fLaC' + bytes([0x80]) + len(streaminfo).to_bytes(3, 'big') + streaminfo)
+
+    audio = FLAC(path)
+    picture = Picture()
+    picture.type = 3
+    picture.mime = 'image/jpeg'
+    picture.data = cover
+    audio.add_picture(picture)
+    audio['TITLE'] = os.path.basename(path)
+    audio['ARTIST'] = 'Check'
+    audio['ALBUM'] = 'Embedded'
+    audio.save()
+
+
+def cover_bytes(index, size):
+    image = Image.new('RGB', (size, size), ((index * 70) % 256, (index * 130) % 256, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def temp_files():
+    return sorted(name for name in os.listdir(temp_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that embedded artwork never round-trips through the temp dir")
+    parser.add_argument('--tracks', type=int, default=5)
+    parser.add_argument('--ticks', type=int, default=20, help="get_current_info calls per track")
+    parser.add_argument('--size', type=int, default=1200, help="embedded cover size in pixels")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(temp_dir)) as library:
+        for i in range(args.tracks):
+            write_flac(os.path.join(library, f"track{i:02d}.flac"), cover_bytes(i, args.size))
+
+        player = LocalMusicPlayer()
+        pipeline = ArtworkPipeline()
+        before = temp_files()
+
+        art_urls = set()
+        for i in range(args.tracks):
+            player.current_file = os.path.join(library, f"track{i:02d}.flac")
+            for _ in range(args.ticks):
+                info = player.get_current_info()
+            art_urls.add(info['art_url'])
+            image = pipeline.decode(pipeline.fetch(info['art_url']))
+            pipeline.create_thumbnail(image)
+
+        after = temp_files()
+
+    shutil.rmtree(temp_dir)
+
+    print(f"{args.tracks} tracks x {args.ticks} ticks, art urls: {sorted(art_urls)}")
+    print(f"temp dir entries before: {len(before)}, after: {len(after)}")
+    created = [name for name in after if name not in before]
+    if created or len(art_urls) != args.tracks or not all(url.startswith('embedded://') for url in art_urls):
+        print(f"FAIL new temp files: {created}")
+        return 1
+    print("ok   no temp files written for embedded artwork")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
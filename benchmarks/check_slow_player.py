@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fake_mpris_player import spawn_player, start_private_bus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that a stalled MPRIS player never blocks the UI loop")
+    parser.add_argument('--latency', type=float, default=3.0, help="seconds the fake player stalls every call")
+    parser.add_argument('--seed-latency', type=float, default=0.5,
+                        help="seconds the fake player stalls GetAll, kept under the timeout so the player seeds")
+    parser.add_argument('--duration', type=float, default=8.0, help="seconds to run the UI loop")
+    parser.add_argument('--frame-ms', type=float, default=1000 / 60, help="longest acceptable stall")
+    args = parser.parse_args()
+
+    daemon, address = start_private_bus()
+    player = spawn_player('slow', '--latency', str(args.latency), '--seed-latency', str(args.seed_latency))
+
+    try:
+        from gi.repository import GLib
+        from ecliptic import Config, MediaController
+
+        controller = MediaController(Config())
+        loop = GLib.MainLoop()
+        interval_ms = 16
+        last_frame = time.monotonic()
+        worst_stall = 0.0
+        frames = 0
+        sent = {}
+
+        def on_frame():
+            nonlocal last_frame, worst_stall, frames
+            now = time.monotonic()
+            worst_stall = max(worst_stall, (now - last_frame) * 1000 - interval_ms)
+            last_frame = now
+            frames += 1
+            return True
+
+        def on_tick():
+            controller.get_current_track_info()
+            return True
+
+        def exercise_controls():
+            handle = controller.current_handle()
+            if handle is None or not handle.seeded:
+                return True
+            sent['PlayPause'] = controller.play_pause()
+            sent['Volume'] = controller.set_volume(0.8)
+            sent['SetPosition'] = controller.set_position(42)
+            sent['Next'] = controller.next_track()
+            sent['Shuffle'] = controller.set_player_property('Shuffle', True)
+            return False
+
+        GLib.timeout_add(interval_ms, on_frame)
+        GLib.timeout_add(100, on_tick)
+        GLib.timeout_add(100, exercise_controls)
+        GLib.timeout_add(int(args.duration * 1000), loop.quit)
+        loop.run()
+
+        print(f"private bus {address}, player stalls {args.latency:.1f}s per call, "
+              f"timeout {controller.config.dbus_call_timeout:.1f}s")
+        for bus_name, stats in controller.latency_stats().items():
+            print(f"{bus_name}: {stats['calls']} calls, {stats['errors']} errors, {stats['timeouts']} timeouts, "
+                  f"{stats['pending']} pending, avg {stats['avg_ms']:.0f} ms, max {stats['max_ms']:.0f} ms")
+        print(f"controls sent: {', '.join(name for name, ok in sent.items() if ok) or 'none'}")
+        print(f"{frames} frames, worst UI stall {worst_stall:.1f} ms (budget {args.frame_ms:.1f} ms)")
+
+        stats = controller.latency_stats()
+        stalled = sum(entry['timeouts'] + entry['pending'] for entry in stats.values())
+        if not sent or not all(sent.values()):
+            print("FAIL player never seeded, so no control calls were sent")
+            return 1
+        if args.latency > controller.config.dbus_call_timeout and not stalled:
+            print("FAIL no call timed out or stayed pending; the player was not actually slow")
+            return 1
+        if worst_stall > args.frame_ms:
+            print("FAIL UI loop blocked on D-Bus")
+            return 1
+        print(f"ok   {len(sent)} controls sent, {stalled} calls timed out or pending, "
+              f"UI loop never blocked longer than a frame")
+        return 0
+    finally:
+        player.terminate()
+        daemon.terminate()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
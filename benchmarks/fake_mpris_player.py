@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import dbus
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+MPRIS_PATH = '/org/mpris/MediaPlayer2'
+ROOT_INTERFACE = 'org.mpris.MediaPlayer2'
+PLAYER_INTERFACE = 'org.mpris.MediaPlayer2.Player'
+
+
+def start_private_bus():
+    daemon = subprocess.Popen(
+        ['dbus-daemon', '--session', '--nofork', '--print-address=1'],
+        stdout=subprocess.PIPE, text=True
+    )
+    address = daemon.stdout.readline().strip()
+    os.environ['DBUS_SESSION_BUS_ADDRESS'] = address
+    return daemon, address
+
+
+def spawn_player(name, *options):
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--name', name, *options],
+        stdout=subprocess.PIPE, text=True
+    )
+    process.stdout.readline()
+    return process
+
+
+WRITABLE_PROPERTIES = {
+    'LoopStatus': dbus.String,
+    'Rate': dbus.Double,
+    'Shuffle': dbus.Boolean,
+    'Volume': dbus.Double,
+}
+
+
+DEFAULT_TRACKS = [
+    {'title': f'Track {i}', 'artist': 'Fake Artist', 'album': 'Fake Album', 'length': 180}
+    for i in range(10)
+]
+
+
+class FakePlayer(dbus.service.Object):
+    def __init__(self, bus, latency=0.0, jitter=0.0, tracks=None, seed_latency=None):
+        super().__init__(bus, MPRIS_PATH)
+        self.latency = latency
+        self.seed_latency = latency if seed_latency is None else seed_latency
+        self.jitter = jitter
+        self.tracks = tracks or DEFAULT_TRACKS
+        self.track = 0
+        self.calls = 0
+        self.root_properties = {
+            'Identity': 'Fake Player',
+            'CanQuit': False,
+            'CanRaise': False,
+            'HasTrackList': False,
+        }
+        self.player_properties = {
+            'PlaybackStatus': 'Playing',
+            'LoopStatus': 'None',
+            'Rate': 1.0,
+            'Shuffle': False,
+            'Volume': 0.5,
+            'Position': dbus.Int64(0),
+            'CanGoNext': True,
+            'CanGoPrevious': True,
+            'CanPlay': True,
+            'CanPause': True,
+            'CanSeek': True,
+            'CanControl': True,
+            'Metadata': self.metadata(),
+        }
+
+    def metadata(self):
+        track = self.tracks[self.track % len(self.tracks)]
+        metadata = {
+            'mpris:trackid': dbus.ObjectPath(f'/org/ecliptic/track/{self.track}'),
+            'mpris:length': dbus.Int64(int(track.get('length', 180) * 1000000)),
+            'xesam:title': track.get('title', f'Track {self.track}'),
+            'xesam:artist': dbus.Array([track.get('artist', 'Fake Artist')], signature='s'),
+            'xesam:album': track.get('album', 'Fake Album'),
+        }
+        if track.get('art_url'):
+            metadata['mpris:artUrl'] = track['art_url']
+        return dbus.Dictionary(metadata, signature='sv')
+
+    def delay(self, latency=None):
+        self.calls += 1
+        stall = (self.latency if latency is None else latency) + random.uniform(0, self.jitter)
+        if stall:
+            time.sleep(stall)
+
+    def advance(self):
+        self.track += 1
+        self.player_properties['Position'] = dbus.Int64(0)
+        self.change(Metadata=self.metadata())
+        return True
+
+    def storm(self, properties):
+        name = random.choice(properties)
+        if name == 'Metadata':
+            self.advance()
+        elif name == 'Volume':
+            self.change(Volume=random.random())
+        elif name == 'PlaybackStatus':
+            playing = self.player_properties['PlaybackStatus'] == 'Playing'
+            self.change(PlaybackStatus='Paused' if playing else 'Playing')
+        else:
+            self.Seeked(dbus.Int64(random.randint(0, 180 * 1000000)))
+        return True
+
+    def properties_for(self, interface):
+        if interface == ROOT_INTERFACE:
+            return self.root_properties
+        if interface == PLAYER_INTERFACE:
+            return self.player_properties
+        raise dbus.exceptions.DBusException(
+            f'No such interface {interface}', name='org.freedesktop.DBus.Error.UnknownInterface'
+        )
+
+    def change(self, **properties):
+        self.player_properties.update(properties)
+        self.PropertiesChanged(PLAYER_INTERFACE, properties, [])
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature='ss', out_signature='v')
+    def Get(self, interface, name):
+        self.delay()
+        return self.properties_for(interface)[name]
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature='s', out_signature='a{sv}')
+    def GetAll(self, interface):
+        self.delay(self.seed_latency)
+        return dbus.Dictionary(self.properties_for(interface), signature='sv')
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature='ssv')
+    def Set(self, interface, name, value):
+        self.delay()
+        expected = WRITABLE_PROPERTIES.get(name) if interface == PLAYER_INTERFACE else None
+        if expected is None:
+            raise dbus.exceptions.DBusException(
+                f'Property {name} is not writable', name='org.freedesktop.DBus.Error.PropertyReadOnly'
+            )
+        if value.variant_level != 1 or not isinstance(value, expected):
+            raise dbus.exceptions.DBusException(
+                f'Set {name} expects a variant holding {expected.__name__}, got {type(value).__name__} '
+                f'at variant level {value.variant_level}', name='org.freedesktop.DBus.Error.InvalidArgs'
+            )
+        self.change(**{name: value})
+
+    @dbus.service.signal(dbus.PROPERTIES_IFACE, signature='sa{sv}as')
+    def PropertiesChanged(self, interface, changed, invalidated):
+        pass
+
+    @dbus.service.signal(PLAYER_INTERFACE, signature='x')
+    def Seeked(self, position):
+        pass
+
+    @dbus.service.method(PLAYER_INTERFACE)
+    def PlayPause(self):
+        self.delay()
+        playing = self.player_properties['PlaybackStatus'] == 'Playing'
+        self.change(PlaybackStatus='Paused' if playing else 'Playing')
+
+    @dbus.service.method(PLAYER_INTERFACE)
+    def Next(self):
+        self.delay()
+        self.advance()
+
+    @dbus.service.method(PLAYER_INTERFACE)
+    def Previous(self):
+        self.delay()
+        self.track = max(0, self.track - 1)
+        self.change(Metadata=self.metadata())
+
+    @dbus.service.method(PLAYER_INTERFACE, in_signature='x')
+    def Seek(self, offset):
+        self.delay()
+        self.player_properties['Position'] = dbus.Int64(max(0, self.player_properties['Position'] + offset))
+        self.Seeked(self.player_properties['Position'])
+
+    @dbus.service.method(PLAYER_INTERFACE, in_signature='ox')
+    def SetPosition(self, track_id, position):
+        self.delay()
+        self.player_properties['Position'] = dbus.Int64(position)
+        self.Seeked(position)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in MPRIS2 player for tests and benchmarks")
+    parser.add_argument('--name', default='fake', help="bus name suffix after org.mpris.MediaPlayer2.")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds to stall every call")
+    parser.add_argument('--seed-latency', type=float,
+                        help="seconds to stall GetAll, so a player can seed quickly and then hang (default: --latency)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random stall of up to this many seconds")
+    parser.add_argument('--tracks', metavar='JSON',
+                        help="file with a list of {title, artist, album, length, art_url} tracks")
+    parser.add_argument('--advance', type=float, default=0.0, help="skip to the next track every N seconds")
+    parser.add_argument('--storm', type=float, default=0.0, help="emit this many property signals per second")
+    parser.add_argument('--storm-properties', default='Volume,Seeked',
+                        help="comma-separated signals to storm: Volume, PlaybackStatus, Metadata, Seeked")
+    args = parser.parse_args()
+
+    tracks = None
+    if args.tracks:
+        with open(args.tracks) as f:
+            tracks = json.load(f)
+
+    DBusGMainLoop(set_as_default=True)
+    bus = dbus.SessionBus()
+    bus_name = dbus.service.BusName(f'org.mpris.MediaPlayer2.{args.name}', bus)
+    player = FakePlayer(bus, latency=args.latency, jitter=args.jitter, tracks=tracks,
+                        seed_latency=args.seed_latency)
+
+    if args.advance:
+        GLib.timeout_add(int(args.advance * 1000), player.advance)
+    if args.storm:
+        GLib.timeout_add(max(1, int(1000 / args.storm)), player.storm, args.storm_properties.split(','))
+
+    print('ready', flush=True)
+    GLib.MainLoop().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import cairo
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ecliptic import (CAVA_RECORDING_MAGIC, CavaVisualizer, SpectrogramRenderer,
+                      VisualizerRenderer, open_cava_recording)
+
+
+STAGES = ('parse', 'smooth', 'render')
+
+
+class ReplayVisualizer(CavaVisualizer):
+    def __init__(self, data_format, bars, renderer, width, height, rate, peak_hold=False):
+        super().__init__(data_format=data_format, bars=bars, peak_hold=peak_hold)
+        self.renderer = renderer
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / rate if rate else 0.0
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        self.cr = cairo.Context(self.surface)
+        self.wall = {stage: [] for stage in STAGES}
+        self.cpu = {stage: 0.0 for stage in STAGES}
+        self.frames = 0
+        self.started = None
+        self.mark()
+
+    def mark(self):
+        self.last_wall = time.perf_counter()
+        self.last_cpu = time.process_time()
+
+    def lap(self, stage):
+        now_wall = time.perf_counter()
+        now_cpu = time.process_time()
+        self.wall[stage].append(now_wall - self.last_wall)
+        self.cpu[stage] += now_cpu - self.last_cpu
+        self.last_wall = now_wall
+        self.last_cpu = now_cpu
+
+    def _process_frame(self, raw_values):
+        self.lap('parse')
+
+        super()._process_frame(raw_values)
+        frame = self.mailbox.take()
+        peaks = None
+        if frame.ndim == 2:
+            frame, peaks = frame
+        self.lap('smooth')
+
+        cr = self.cr
+        cr.set_operator(cairo.OPERATOR_CLEAR)
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
+        if isinstance(self.renderer, SpectrogramRenderer):
+            self.renderer.push(frame)
+        self.renderer.draw(cr, self.width, self.height, frame, peaks)
+        self.surface.flush()
+        self.lap('render')
+
+        self.frames += 1
+        if self.interval:
+            delay = self.started + self.frames * self.interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.mark()
+
+
+def synthesize(path, frames, bars):
+    rng = np.random.default_rng(0)
+    t = np.arange(frames)[:, None] / 60.0
+    bands = np.arange(bars)[None, :]
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * (t * 0.5 + bands / bars))
+    noise = rng.random((frames, bars)) * 0.3
+    values = np.clip((envelope * 0.7 + noise) * 65535, 0, 65535).astype(np.uint16)
+    with open(path, 'wb') as f:
+        f.write(f"{CAVA_RECORDING_MAGIC} binary {bars}\n".encode())
+        f.write(values.tobytes())
+    print(f"Synthesized {frames} frames to {path}")
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000) if len(samples) else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded cava stream through the visualizer pipeline')
+    parser.add_argument('recording', help='File written by ecliptic.py --record-cava')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Frames per second to replay at (0 = as fast as possible, 60 = real time)')
+    parser.add_argument('--style', choices=['wave', 'spectrogram'], default='wave')
+    parser.add_argument('--peak-hold', action='store_true', help='Publish and draw peak markers')
+    parser.add_argument('--width', type=int, default=400)
+    parser.add_argument('--height', type=int, default=80)
+    parser.add_argument('--synthesize', type=int, metavar='FRAMES',
+                        help='Write a synthetic recording of FRAMES frames to the given path first')
+    parser.add_argument('--bars', type=int, default=100, help='Bars for --synthesize')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize(args.recording, args.synthesize, args.bars)
+
+    stream, data_format, bars = open_cava_recording(args.recording)
+    renderer = SpectrogramRenderer() if args.style == 'spectrogram' else VisualizerRenderer()
+    visualizer = ReplayVisualizer(data_format, bars, renderer, args.width, args.height, args.rate, args.peak_hold)
+
+    with stream:
+        visualizer.started = time.perf_counter()
+        visualizer.mark()
+        if data_format == 'binary':
+            visualizer._read_binary(stream)
+        else:
+            visualizer._read_ascii(stream)
+        elapsed = time.perf_counter() - visualizer.started
+
+    totals = np.sum([visualizer.wall[stage] for stage in STAGES], axis=0) if visualizer.frames else []
+    results = {
+        'frames': visualizer.frames,
+        'fps': visualizer.frames / elapsed if elapsed else 0.0,
+        'p50_ms': percentile_ms(totals, 50),
+        'p99_ms': percentile_ms(totals, 99),
+        'cpu_ms_per_frame': {
+            stage: visualizer.cpu[stage] / max(visualizer.frames, 1) * 1000 for stage in STAGES
+        }
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{results['frames']} frames ({data_format}, {bars} bars, {args.style}) in {elapsed:.2f}s")
+    print(f"fps: {results['fps']:.1f}   p50: {results['p50_ms']:.3f} ms   p99: {results['p99_ms']:.3f} ms")
+    for stage in STAGES:
+        print(f"  {stage:<7} {results['cpu_ms_per_frame'][stage]:.3f} ms CPU / frame")
+
+
+if __name__ == "__main__":
+    main()
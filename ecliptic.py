@@ -5,7 +5,6 @@ gi.require_version('Gtk', '3.0')
 gi.require_version('Gdk', '3.0')
 from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, Pango
 import cairo
-import struct
 import dbus
 import dbus.service
 from dbus.mainloop.glib import DBusGMainLoop
@@ -17,13 +16,13 @@ import numpy as np
 import math
 import os
 import urllib.request
+import urllib.parse
 import io
 import argparse
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageFilter
 import requests
 import colorsys
 import hashlib
-import tempfile
 import select
 import signal
 import glob
@@ -39,19 +38,160 @@ from mutagen.mp4 import MP4
 from mutagen.oggvorbis import OggVorbis
 from mutagen.id3 import ID3NoHeaderError
 import base64
+from collections import OrderedDict, deque
+import wave
+
+CAVA_RECORDING_MAGIC = "ECLIPTIC-CAVA"
+
+def open_cava_recording(path):
+    stream = open(path, 'rb')
+    header = stream.readline().decode().split()
+    if len(header) != 3 or header[0] != CAVA_RECORDING_MAGIC:
+        stream.close()
+        raise ValueError(f"Not a cava recording: {path}")
+    return stream, header[1], int(header[2])
+
+class FramePipeline:
+    def __init__(self, bars, value_scale=1.0 / 700.0, smoothing_factor=0.7,
+                 peak_hold=False, peak_decay=0.01, auto_gain=False, gain_decay=0.995,
+                 gravity=False, gravity_accel=0.004):
+        self.bars = bars
+        self.value_scale = value_scale
+        self.smoothing_factor = smoothing_factor
+        self.peak_hold = peak_hold
+        self.peak_decay = peak_decay
+        self.auto_gain = auto_gain
+        self.gain_decay = gain_decay
+        self.gravity = gravity
+        self.gravity_accel = gravity_accel
+
+        self.frame = np.zeros(bars, dtype=np.float32)
+        self.smoothed = np.zeros(bars, dtype=np.float32)
+        self.levels = np.zeros((2, bars), dtype=np.float32)
+        self.output = self.levels[0]
+        self.peaks = self.levels[1]
+        self.published = self.levels if peak_hold else self.output
+        self.fall_speed = np.zeros(bars, dtype=np.float32)
+        self.falling = np.zeros(bars, dtype=bool)
+        self.gain_level = 0.0
+        self.primed = False
+
+    def reset(self):
+        self.smoothed.fill(0)
+        self.output.fill(0)
+        self.peaks.fill(0)
+        self.fall_speed.fill(0)
+        self.gain_level = 0.0
+        self.primed = False
+
+    def process(self, raw_values):
+        frame = self.frame
+        np.copyto(frame, raw_values, casting='unsafe')
+        frame *= self.value_scale
+        np.sqrt(frame, out=frame)
+
+        if self.auto_gain:
+            self.gain_level = max(float(frame.max()), self.gain_level * self.gain_decay)
+            if self.gain_level > 1e-6:
+                frame *= 1.0 / self.gain_level
+
+        smoothed = self.smoothed
+        if self.primed:
+            smoothed *= self.smoothing_factor
+            frame *= 1.0 - self.smoothing_factor
+            smoothed += frame
+        else:
+            np.copyto(smoothed, frame)
+            self.primed = True
+
+        output = self.output
+        if self.gravity:
+            self.fall_speed += self.gravity_accel
+            output -= self.fall_speed
+            np.greater(output, smoothed, out=self.falling)
+            self.fall_speed *= self.falling
+            np.maximum(output, smoothed, out=output)
+        else:
+            np.copyto(output, smoothed)
+
+        if self.peak_hold:
+            self.peaks -= self.peak_decay
+            np.maximum(self.peaks, output, out=self.peaks)
+
+        return output
+
+class FrameMailbox:
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        self.slot = np.zeros(size, dtype=np.float32)
+        self.front = np.zeros(size, dtype=np.float32)
+        self.dirty = False
+        self.produced = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def post(self, frame):
+        with self.lock:
+            if self.slot.shape != np.shape(frame):
+                self.slot = np.array(frame, dtype=np.float32)
+            else:
+                np.copyto(self.slot, frame, casting='unsafe')
+            if self.dirty:
+                self.dropped += 1
+            self.dirty = True
+            self.produced += 1
+
+    def take(self):
+        with self.lock:
+            if not self.dirty:
+                return None
+            self.slot, self.front = self.front, self.slot
+            self.dirty = False
+            self.delivered += 1
+            return self.front
+
+    def stats(self):
+        with self.lock:
+            return {
+                'produced': self.produced,
+                'delivered': self.delivered,
+                'dropped': self.dropped
+            }
 
 class CavaVisualizer:
-    def __init__(self, callback=None):
-        self.callback = callback
+    def __init__(self, data_format='binary', bars=100,
+                 peak_hold=False, auto_gain=False, gravity=False):
         self.process = None
         self.running = False
-        self.bars = 100
-        self.points = [0] * self.bars
+        self.bars = bars
         self.max_value = 255.0
+        self.max_range = 1000
         self.smoothing_factor = 0.7
+        self.data_format = data_format
+        self.pipeline = FramePipeline(
+            bars,
+            value_scale=self.value_scale(),
+            smoothing_factor=self.smoothing_factor,
+            peak_hold=peak_hold,
+            auto_gain=auto_gain,
+            gravity=gravity
+        )
+        self.points = self.pipeline.output
+        self.mailbox = FrameMailbox(self.pipeline.published.shape)
+        self.grace_period = 10
+        self.teardown_id = None
+        self.spawn_count = 0
+        self.spawn_started = None
+        self.spawn_latency = 0.0
+        self.record_file = None
         self.config_content = self.create_cava_config()
 
     def create_cava_config(self):
+        if self.data_format == 'binary':
+            format_options = "data_format = binary\nbit_format = 16bit"
+        else:
+            format_options = f"data_format = ascii\nascii_max_range = {self.max_range}"
+
         return f"""
 [general]
 mode = waves
@@ -61,21 +201,57 @@ bars = {self.bars}
 [output]
 method = raw
 raw_target = /dev/stdout
-data_format = ascii
+{format_options}
 channels = mono
 mono_option = average
 [smoothing]
 noise_reduction = 20
 """
+
+    def write_config(self):
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        if runtime_dir and os.path.isdir(runtime_dir):
+            config_dir = os.path.join(runtime_dir, 'ecliptic')
+        else:
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+            config_dir = os.path.join(cache_home, 'ecliptic')
+        os.makedirs(config_dir, mode=0o700, exist_ok=True)
+
+        config_path = os.path.join(config_dir, 'cava.conf')
+        try:
+            with open(config_path, 'r') as f:
+                if f.read() == self.config_content:
+                    return config_path
+        except OSError:
+            pass
+
+        temp_path = f"{config_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.config_content)
+        os.replace(temp_path, config_path)
+        return config_path
+
     def start(self):
         if self.running:
             return
 
+        self.cancel_teardown()
+
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.send_signal(signal.SIGCONT)
+                self.running = True
+                return
+            except Exception:
+                self.shutdown()
+
+        self.spawn()
+
+    def spawn(self):
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.conf', delete=False) as f:
-                f.write(self.config_content)
-                config_path = f.name
+            config_path = self.write_config()
 
+            self.spawn_started = time.monotonic()
             self.process = subprocess.Popen(
                 ['cava', '-p', config_path],
                 stdout=subprocess.PIPE,
@@ -83,93 +259,357 @@ noise_reduction = 20
                 bufsize=0
             )
 
+            self.spawn_count += 1
             self.running = True
 
-            self.read_thread = threading.Thread(target=self._read_data, daemon=True)
+            self.read_thread = threading.Thread(target=self._read_data, args=(self.process,), daemon=True)
             self.read_thread.start()
 
             print("Cava audio visualizer started")
 
         except FileNotFoundError:
+            self.spawn_started = None
             print("Cava not found. Install with: sudo apt install cava")
         except Exception as e:
+            self.spawn_started = None
             print(f"Failed to start cava: {e}")
 
     def stop(self):
+        if not self.running:
+            return
+
+        self.running = False
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.send_signal(signal.SIGSTOP)
+            except Exception:
+                pass
+
+        self.cancel_teardown()
+        self.teardown_id = GLib.timeout_add_seconds(self.grace_period, self._on_grace_expired)
+
+    def cancel_teardown(self):
+        if self.teardown_id is not None:
+            GLib.source_remove(self.teardown_id)
+            self.teardown_id = None
+
+    def _on_grace_expired(self):
+        self.teardown_id = None
+        self.shutdown()
+        return False
+
+    def shutdown(self):
+        self.cancel_teardown()
         self.running = False
         if self.process:
             try:
                 self.process.terminate()
+                self.process.send_signal(signal.SIGCONT)
                 self.process.wait(timeout=2)
             except subprocess.TimeoutExpired:
                 self.process.kill()
             except:
                 pass
             self.process = None
-        print("Cava audio visualizer stopped")
+            stats = self.stats()
+            print(f"Cava audio visualizer stopped ({stats['produced']} frames, "
+                  f"{stats['delivered']} delivered, {stats['dropped']} dropped, "
+                  f"{stats['spawns']} spawns, last spawn latency {stats['spawn_latency_ms']:.0f} ms)")
+
+    def stats(self):
+        stats = self.mailbox.stats()
+        stats['spawns'] = self.spawn_count
+        stats['spawn_latency_ms'] = self.spawn_latency * 1000
+        return stats
+
+    def start_recording(self, path):
+        self.stop_recording()
+        record_file = open(path, 'wb')
+        record_file.write(f"{CAVA_RECORDING_MAGIC} {self.data_format} {self.bars}\n".encode())
+        self.record_file = record_file
+        print(f"Recording cava stream to {path}")
+
+    def stop_recording(self):
+        record_file, self.record_file = self.record_file, None
+        if record_file:
+            record_file.close()
+
+    def _record(self, data):
+        record_file = self.record_file
+        if record_file:
+            try:
+                record_file.write(data)
+            except ValueError:
+                pass
+
+    def value_scale(self):
+        if self.data_format == 'binary':
+            return self.max_range / 65535.0 / 700.0
+        return 1.0 / 700.0
+
+    def _read_data(self, process):
+        try:
+            if self.data_format == 'binary':
+                self._read_binary(process.stdout)
+            else:
+                self._read_ascii(process.stdout)
+        except Exception as e:
+            if self.process is process:
+                print(f"Cava read error: {e}")
+
+    def _read_binary(self, stream):
+        frame_bytes = self.bars * 2
+        buf = bytearray(frame_bytes)
+        view = memoryview(buf)
+        frame = np.frombuffer(buf, dtype=np.uint16)
+
+        while True:
+            filled = 0
+            while filled < frame_bytes:
+                count = stream.readinto(view[filled:])
+                if not count:
+                    return
+                filled += count
+            if self.record_file:
+                self._record(buf)
+            self._process_frame(frame)
+
+    def _read_ascii(self, stream):
+        buffer = b""
+
+        while True:
+            chunk = stream.read(4096)
+            if not chunk:
+                return
+            buffer += chunk
+            if self.record_file:
+                self._record(chunk)
+
+            lines = buffer.split(b'\n')
+            buffer = lines.pop()
+
+            for line in lines:
+                raw_values = [float(x) for x in line.split(b';') if x.strip()]
+                if len(raw_values) == self.bars:
+                    self._process_frame(raw_values)
+
+    def _process_frame(self, raw_values):
+        if self.spawn_started is not None:
+            self.spawn_latency = time.monotonic() - self.spawn_started
+            self.spawn_started = None
+
+        self.points = self.pipeline.process(raw_values)
+        self.mailbox.post(self.pipeline.published)
+
+class SpectrumAnalyzer:
+    def __init__(self, bars=100, sample_rate=44100, fft_size=4096, framerate=60,
+                 min_freq=50.0, max_freq=12000.0, mailbox=None,
+                 peak_hold=False, gravity=False):
+        self.bars = bars
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.hop_size = sample_rate // framerate
+        self.smoothing_factor = 0.7
 
-    def _read_data(self):
-        buffer = ""
+        self.window = np.hanning(fft_size).astype(np.float32)
+        self.samples = np.zeros(fft_size, dtype=np.float32)
+        self.block = np.zeros(fft_size, dtype=np.float32)
+        self.pending = np.zeros(0, dtype=np.float32)
+
+        edges = np.geomspace(min_freq, max_freq, bars + 1)
+        bins = np.floor(edges * fft_size / sample_rate).astype(np.int64)
+        for i in range(1, len(bins)):
+            bins[i] = max(bins[i], bins[i - 1] + 1)
+        self.band_starts = bins[:-1]
+        self.band_end = min(int(bins[-1]), fft_size // 2 + 1)
+        self.band_widths = np.diff(bins).astype(np.float32)
+        self.band_values = np.zeros(bars, dtype=np.float32)
+
+        self.pipeline = FramePipeline(
+            bars,
+            value_scale=4.0 / fft_size,
+            smoothing_factor=self.smoothing_factor,
+            peak_hold=peak_hold,
+            auto_gain=True,
+            gravity=gravity
+        )
+        self.points = self.pipeline.output
+        self.mailbox = mailbox or FrameMailbox(self.pipeline.published.shape)
+
+    def analyze_block(self, block):
+        np.multiply(block, self.window, out=self.block)
+        spectrum = np.abs(np.fft.rfft(self.block))
+        np.add.reduceat(spectrum[:self.band_end], self.band_starts, out=self.band_values)
+        self.band_values /= self.band_widths
+        self.points = self.pipeline.process(self.band_values)
+        return self.points
+
+    def feed(self, samples):
+        if len(self.pending):
+            samples = np.concatenate((self.pending, samples))
+
+        frames = 0
+        offset = 0
+        while len(samples) - offset >= self.hop_size:
+            hop = samples[offset:offset + self.hop_size]
+            self.samples[:-self.hop_size] = self.samples[self.hop_size:]
+            self.samples[-self.hop_size:] = hop
+            self.analyze_block(self.samples)
+            self.mailbox.post(self.pipeline.published)
+            offset += self.hop_size
+            frames += 1
+
+        self.pending = samples[offset:].copy()
+        return frames
+
+    def reset(self):
+        self.samples.fill(0)
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.pipeline.reset()
+
+    def analyze_wav(self, path):
+        with wave.open(str(path), 'rb') as wav:
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            if wav.getframerate() != self.sample_rate:
+                raise ValueError(f"Expected {self.sample_rate} Hz audio, got {wav.getframerate()} Hz")
+            if sample_width != 2:
+                raise ValueError("Only 16-bit PCM WAV files are supported")
+            data = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+        samples = data.reshape(-1, channels).mean(axis=1, dtype=np.float32) / 32768.0
+
+        self.reset()
+        frames = []
+        for start in range(0, len(samples) - self.hop_size + 1, self.hop_size):
+            self.feed(samples[start:start + self.hop_size])
+            frames.append(self.points.copy())
+        return np.array(frames, dtype=np.float32).reshape(-1, self.bars)
+
+class PlaybackTap:
+    def __init__(self, decoder, player, analyzer, start_position=0, channels=2, lead=0.25, output_latency=0.1):
+        self.decoder = decoder
+        self.player = player
+        self.analyzer = analyzer
+        self.start_position = start_position
+        self.sample_rate = analyzer.sample_rate
+        self.channels = channels
+        self.lead = lead
+        self.output_latency = output_latency
+        self.started = None
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def elapsed(self):
+        if self.started is None:
+            return -self.output_latency
+        return time.monotonic() - self.started - self.output_latency
+
+    def position(self):
+        return self.start_position + max(0.0, self.elapsed())
 
-        while self.running and self.process and self.process.poll() is None:
+    def stop(self):
+        self.running = False
+        for process in (self.player, self.decoder):
             try:
-                char = self.process.stdout.read(1).decode('utf-8')
-                if not char:
-                    time.sleep(0.01)
-                    continue
-                buffer += char
-
-                if '\n' in buffer:
-                    lines = buffer.split('\n')
-                    buffer = lines[-1]
-
-                    for line in lines[:-1]:
-                        if line.strip():
-                            raw_values = [float(x) for x in line.strip().split(';') if x.strip()]
-                            if len(raw_values) == self.bars:
-                                normalized_points = [math.sqrt(i / 700.0) for i in raw_values]
-
-                                if hasattr(self, 'prev_points'):
-                                    smoothed_points = []
-                                    for i, point in enumerate(normalized_points):
-                                        if i < len(self.prev_points):
-                                            smooth_val = (self.prev_points[i] * self.smoothing_factor +
-                                                        point * (1 - self.smoothing_factor))
-                                        else:
-                                            smooth_val = point
-                                        smoothed_points.append(smooth_val)
-                                    self.prev_points = smoothed_points
-                                    self.points = smoothed_points
-                                else:
-                                    self.prev_points = normalized_points
-                                    self.points = normalized_points
-
-                                if self.callback:
-                                    GLib.idle_add(self.callback, self.points.copy())
+                process.terminate()
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            except:
+                pass
 
-            except Exception as e:
-                if self.running:
-                    print(f"Cava read error: {e}")
+    @staticmethod
+    def _read_exact(stream, size):
+        data = bytearray()
+        while len(data) < size:
+            block = stream.read(size - len(data))
+            if not block:
                 break
+            data += block
+        return bytes(data)
+
+    def _forward_header(self, source, sink):
+        header = self._read_exact(source, 12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise ValueError("decoder did not produce a WAV stream")
+        sink.write(header)
+
+        while True:
+            chunk = self._read_exact(source, 8)
+            if len(chunk) < 8:
+                raise ValueError("truncated WAV header")
+            sink.write(chunk)
+            if chunk[:4] == b'data':
+                return
+            size = int.from_bytes(chunk[4:], 'little')
+            sink.write(self._read_exact(source, size + (size & 1)))
+
+    def _feed_due(self, pending):
+        now = self.elapsed()
+        while pending and pending[0][0] <= now:
+            self.analyzer.feed(pending.popleft()[1])
+
+    def _run(self):
+        hop = self.analyzer.hop_size
+        frame_bytes = 2 * self.channels
+        buf = bytearray(hop * frame_bytes)
+        view = memoryview(buf)
+        pcm = np.frombuffer(buf, dtype=np.int16).reshape(hop, self.channels)
+        source = self.decoder.stdout
+        sink = self.player.stdin
+        pending = deque()
+        written = 0
 
-class VisualizerWidget(Gtk.DrawingArea):
-    def __init__(self):
-        super().__init__()
+        try:
+            self._forward_header(source, sink)
+            while self.running:
+                filled = 0
+                while filled < len(buf):
+                    count = source.readinto(view[filled:])
+                    if not count:
+                        break
+                    filled += count
+
+                frames = filled // frame_bytes
+                if frames:
+                    sink.write(view[:frames * frame_bytes])
+                    if self.started is None:
+                        self.started = time.monotonic()
+                    samples = pcm[:frames].mean(axis=1, dtype=np.float32) / 32768.0
+                    pending.append((written / self.sample_rate, samples))
+                    written += frames
+
+                self._feed_due(pending)
+                if filled < len(buf):
+                    break
+
+                ahead = written / self.sample_rate - (time.monotonic() - self.started)
+                if ahead > self.lead:
+                    time.sleep(ahead - self.lead)
+
+            sink.close()
+            while self.running and pending:
+                time.sleep(hop / self.sample_rate)
+                self._feed_due(pending)
+        except Exception as e:
+            if self.running:
+                print(f"Spectrum analyzer tap error: {e}")
 
-        self.points = [0] * 200
+class VisualizerRenderer:
+    def __init__(self):
         self.color = (1.0, 1.0, 1.0, 0.6)
         self.colors = [(1.0, 1.0, 1.0), (0.9, 0.9, 0.9), (0.8, 0.8, 0.8)]
-
-        self.connect('draw', self.on_draw)
-
-    def set_points(self, points):
-        if points and len(points) > 0:
-            self.points = points
-            self.queue_draw()
+        self.layers = 30
+        self.x_key = None
+        self.xs = None
+        self.gradient_key = None
+        self.gradient = None
+        self.line_color = None
 
     def set_color(self, r, g, b, a=0.8):
         self.color = (r, g, b, a)
-        self.queue_draw()
 
     def interpolate_color(self, colors, position):
         if len(colors) == 1:
@@ -193,12 +633,34 @@ class VisualizerWidget(Gtk.DrawingArea):
 
         return color
 
-    def on_draw(self, widget, cr):
-        allocation = widget.get_allocation()
-        width = allocation.width
-        height = allocation.height
-
-        if not self.points:
+    def x_coords(self, width, count):
+        key = (width, count)
+        if self.x_key != key:
+            self.xs = np.linspace(0, width, count).tolist()
+            self.x_key = key
+        return self.xs
+
+    def fill_gradient(self, height):
+        key = (tuple(self.colors), height)
+        if self.gradient_key != key:
+            gradient = cairo.LinearGradient(0, 0, 0, height)
+            composite = np.zeros(3)
+            coverage = 0.0
+            for i in range(self.layers):
+                alpha = i / self.layers
+                layer_alpha = 0.6 - alpha * 0.4
+                color = np.array(self.interpolate_color(self.colors, alpha))
+                composite = color * layer_alpha + composite * (1.0 - layer_alpha)
+                coverage = layer_alpha + coverage * (1.0 - layer_alpha)
+                r, g, b = (composite / coverage).tolist()
+                gradient.add_color_stop_rgba(i / (self.layers - 1), r, g, b, coverage)
+            self.gradient = gradient
+            self.line_color = self.interpolate_color(self.colors, 0.5)
+            self.gradient_key = key
+        return self.gradient
+
+    def draw(self, cr, width, height, points, peaks=None):
+        if points is None or len(points) == 0:
             cr.set_source_rgba(*self.color)
             cr.move_to(0, height / 2)
             for x in range(width):
@@ -209,107 +671,408 @@ class VisualizerWidget(Gtk.DrawingArea):
             cr.line_to(0, height)
             cr.close_path()
             cr.fill()
-            return False
+            return
 
-        ls = len(self.points)
-        if ls < 2:
-            return False
+        count = len(points)
+        if count < 2:
+            return
 
-        points = []
+        xs = self.x_coords(width, count)
+        ys = ((1.0 - np.asarray(points, dtype=np.float32)) * height).tolist()
 
-        x = 0
-        y = (1.0 - self.points[0]) * height
-        points.extend([x, y])
+        cr.new_path()
+        cr.move_to(xs[0], ys[0])
+        for x, y in zip(xs[1:], ys[1:]):
+            cr.line_to(x, y)
+        line_path = cr.copy_path()
 
-        for i in range(ls - 1):
-            x1 = (i + 1) * width / (ls - 1)
-            y1 = (1.0 - self.points[i + 1]) * height
+        cr.line_to(width, height)
+        cr.line_to(0, height)
+        cr.close_path()
+        cr.set_source(self.fill_gradient(height))
+        cr.fill()
 
-            if i < ls - 2:
-                x_mid = i * width / (ls - 1) + width / (ls - 1) * 0.5
-                y_mid = (y + y1) * 0.5
-                points.extend([x_mid, y_mid, x1, y1])
-            else:
-                points.extend([x1, y1])
+        r, g, b = self.line_color
+        cr.set_source_rgba(r, g, b, 0.9)
+        cr.set_line_width(2)
+        cr.append_path(line_path)
+        cr.stroke()
 
-            x, y = x1, y1
+        if peaks is not None and len(peaks) == count:
+            self.draw_peaks(cr, width, height, xs, peaks)
 
-        fill_points = points.copy()
-        fill_points.extend([width, height, 0, height])
+    def draw_peaks(self, cr, width, height, xs, peaks):
+        half = max(1.0, width / len(xs) * 0.3)
+        ys = ((1.0 - np.asarray(peaks, dtype=np.float32)) * height).tolist()
 
-        segments = 30
-        for i in range(segments):
-            alpha = i / segments
-            color = self.interpolate_color(self.colors, alpha)
+        cr.new_path()
+        for x, y in zip(xs, ys):
+            cr.move_to(x - half, y)
+            cr.line_to(x + half, y)
+        r, g, b = self.line_color
+        cr.set_source_rgba(r, g, b, 0.7)
+        cr.set_line_width(1.5)
+        cr.stroke()
 
-            scaled_points = []
-            for j in range(0, len(points), 2):
-                x = points[j]
-                y = points[j + 1]
-                scaled_y = y + (height - y) * alpha * 0.3
-                scaled_points.extend([x, scaled_y])
+class SpectrogramRenderer:
+    def __init__(self, history=240):
+        self.history = history
+        self.bars = 0
+        self.head = -1
+        self.surface = None
+        self.pixels = None
+        self.history_levels = None
+        self.lut = None
+        self.set_color_scheme({
+            'primary': (0.4, 0.5, 0.9),
+            'accent': (0.6, 0.7, 1.0),
+            'background': (0.1, 0.1, 0.2)
+        })
 
-            scaled_points.extend([width, height, 0, height])
+    def set_color_scheme(self, color_scheme):
+        stops = [
+            color_scheme.get('background', (0.1, 0.1, 0.2)),
+            color_scheme.get('primary', (0.4, 0.5, 0.9)),
+            color_scheme.get('accent', (0.6, 0.7, 1.0)),
+            (1.0, 1.0, 1.0)
+        ]
+        positions = np.linspace(0, 1, len(stops))
+        ramp = np.linspace(0, 1, 256)
+        channels = [np.interp(ramp, positions, [stop[c] for stop in stops]) for c in range(3)]
+        alpha = np.interp(ramp, [0, 0.15, 1], [0.0, 0.8, 1.0])
+
+        r, g, b = [(channel * alpha * 255).astype(np.uint32) for channel in channels]
+        a = (alpha * 255).astype(np.uint32)
+        self.lut = (a << 24) | (r << 16) | (g << 8) | b
+
+        if self.surface is not None:
+            self.surface.flush()
+            np.take(self.lut, self.history_levels, out=self.pixels)
+            self.surface.mark_dirty()
+
+    def _allocate(self, bars):
+        self.bars = bars
+        self.head = -1
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, self.history, bars)
+        stride_pixels = self.surface.get_stride() // 4
+        buffer = np.ndarray(shape=(bars, stride_pixels), dtype=np.uint32, buffer=self.surface.get_data())
+        self.pixels = buffer[:, :self.history]
+        self.pixels.fill(0)
+        self.history_levels = np.zeros((bars, self.history), dtype=np.uint8)
+        self.levels = np.zeros(bars, dtype=np.float32)
+        self.column = np.zeros(bars, dtype=np.uint8)
+        self.column_pixels = np.zeros(bars, dtype=np.uint32)
+        self.surface.mark_dirty()
+
+    def push(self, points):
+        if len(points) != self.bars:
+            self._allocate(len(points))
+
+        self.head = (self.head + 1) % self.history
+
+        np.multiply(points, 255.0, out=self.levels, casting='unsafe')
+        np.clip(self.levels, 0, 255, out=self.levels)
+        self.column[:] = self.levels[::-1]
+
+        self.surface.flush()
+        self.history_levels[:, self.head] = self.column
+        np.take(self.lut, self.column, out=self.column_pixels)
+        self.pixels[:, self.head] = self.column_pixels
+        self.surface.mark_dirty_rectangle(self.head, 0, 1, self.bars)
+
+    def draw(self, cr, width, height, points=None, peaks=None):
+        if self.surface is None or self.head < 0:
+            return
 
-            if len(scaled_points) >= 6:
-                try:
-                    cr.set_source_rgba(color[0], color[1], color[2], 0.6 - alpha * 0.4)
-                    cr.new_path()
-                    cr.move_to(scaled_points[0], scaled_points[1])
-                    for k in range(2, len(scaled_points), 2):
-                        cr.line_to(scaled_points[k], scaled_points[k + 1])
-                    cr.close_path()
-                    cr.fill()
-                except:
-                    pass
-
-        if len(points) >= 4:
-            main_color = self.interpolate_color(self.colors, 0.5)
-            cr.set_source_rgba(main_color[0], main_color[1], main_color[2], 0.9)
-            cr.set_line_width(2)
-            cr.new_path()
-            cr.move_to(points[0], points[1])
-            for i in range(2, len(points), 2):
-                cr.line_to(points[i], points[i + 1])
-            cr.stroke()
+        oldest = self.head + 1
+        cr.save()
+        cr.scale(width / self.history, height / self.bars)
+
+        for source_x, length in ((oldest, self.history - oldest), (0, oldest)):
+            if length <= 0:
+                continue
+            dest_x = 0 if source_x == oldest else self.history - oldest
+            cr.set_source_surface(self.surface, dest_x - source_x, 0)
+            cr.get_source().set_filter(cairo.FILTER_FAST)
+            cr.rectangle(dest_x, 0, length, self.bars)
+            cr.fill()
 
-        return False
+        cr.restore()
+
+class VisualizerRasterizer:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.surfaces = [None, None]
+        self.front = 0
+        self.pending = None
+        self.pending_peaks = None
+        self.pending_size = None
+        self.generation = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.render_ms = 0.0
+        self.blit_ms = 0.0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, points, width, height, scale=1, peaks=None):
+        if width <= 0 or height <= 0:
+            return
+        with self.lock:
+            if self.pending is not None:
+                self.skipped += 1
+            self.pending = np.array(points, dtype=np.float32)
+            self.pending_peaks = None if peaks is None else np.array(peaks, dtype=np.float32)
+            self.pending_size = (width, height, scale)
+        self.wakeup.set()
 
-class ColorExtractor:
-    @staticmethod
-    def get_dominant_colors(image_input, num_colors=3):
-        try:
-            if isinstance(image_input, str):
-                if image_input.startswith('http'):
-                    response = requests.get(image_input, timeout=5)
-                    image = Image.open(io.BytesIO(response.content))
-                else:
-                    image = Image.open(image_input)
-            elif isinstance(image_input, (io.BytesIO, io.BufferedReader)):
-                image_input.seek(0)
-                image = Image.open(image_input)
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    def _back_surface(self, width, height, scale):
+        back = 1 - self.front
+        surface = self.surfaces[back]
+        if (surface is None or surface.get_width() != width * scale or
+                surface.get_height() != height * scale):
+            surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width * scale, height * scale)
+            surface.set_device_scale(scale, scale)
+            self.surfaces[back] = surface
+        return back, surface
+
+    def _run(self):
+        while self.running:
+            self.wakeup.wait()
+            self.wakeup.clear()
+
+            with self.lock:
+                points = self.pending
+                peaks = self.pending_peaks
+                size = self.pending_size
+                self.pending = None
+            if points is None or not self.running:
+                continue
+
+            width, height, scale = size
+            started = time.perf_counter()
+            back, surface = self._back_surface(width, height, scale)
+
+            cr = cairo.Context(surface)
+            cr.set_operator(cairo.OPERATOR_CLEAR)
+            cr.paint()
+            cr.set_operator(cairo.OPERATOR_OVER)
+            self.renderer.draw(cr, width, height, points, peaks)
+            surface.flush()
+
+            with self.lock:
+                self.front = back
+                self.generation += 1
+                self.rendered += 1
+                elapsed = (time.perf_counter() - started) * 1000
+                self.render_ms = self.render_ms * 0.9 + elapsed * 0.1
+
+    def blit(self, cr):
+        with self.lock:
+            surface = self.surfaces[self.front]
+            if surface is None:
+                return False
+            started = time.perf_counter()
+            cr.set_source_surface(surface, 0, 0)
+            cr.paint()
+            elapsed = (time.perf_counter() - started) * 1000
+            self.blit_ms = self.blit_ms * 0.9 + elapsed * 0.1
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                'rendered': self.rendered,
+                'skipped': self.skipped,
+                'render_ms': self.render_ms,
+                'blit_ms': self.blit_ms
+            }
+
+class VisualizerWidget(Gtk.DrawingArea):
+    def __init__(self, threaded=False, style='wave'):
+        super().__init__()
+
+        self.points = [0] * 200
+        self.peaks = None
+        self.style = style
+        self.renderer = VisualizerRenderer()
+        self.spectrogram = SpectrogramRenderer()
+        self.rasterizer = None
+        self.drawn_generation = 0
+        self.mailbox = None
+        self.tick_id = None
+
+        self.connect('draw', self.on_draw)
+        self.connect('destroy', self.on_destroy)
+
+        self.set_threaded(threaded)
+
+    def set_threaded(self, threaded):
+        if threaded and not self.rasterizer:
+            self.rasterizer = VisualizerRasterizer(self.renderer)
+            if self.tick_id is None:
+                self.tick_id = self.add_tick_callback(self.on_tick)
+        elif not threaded and self.rasterizer:
+            self.rasterizer.stop()
+            self.rasterizer = None
+        self.queue_draw()
+
+    def attach_mailbox(self, mailbox):
+        self.mailbox = mailbox
+        if mailbox and self.tick_id is None:
+            self.tick_id = self.add_tick_callback(self.on_tick)
+        elif not mailbox and not self.rasterizer and self.tick_id is not None:
+            self.remove_tick_callback(self.tick_id)
+            self.tick_id = None
+
+    def on_tick(self, widget, frame_clock):
+        if self.mailbox:
+            frame = self.mailbox.take()
+            if frame is not None:
+                self.set_points(frame)
+        if self.rasterizer and self.rasterizer.generation != self.drawn_generation:
+            self.queue_draw()
+        return True
+
+    def on_destroy(self, widget):
+        if self.rasterizer:
+            self.rasterizer.stop()
+
+    def render_stats(self):
+        return self.rasterizer.stats() if self.rasterizer else None
+
+    def submit_frame(self):
+        allocation = self.get_allocation()
+        self.rasterizer.submit(self.points, allocation.width, allocation.height, self.get_scale_factor(),
+                               self.peaks)
+
+    def set_style(self, style):
+        self.style = style
+        self.queue_draw()
+
+    def set_color_scheme(self, color_scheme):
+        self.spectrogram.set_color_scheme(color_scheme)
+        if self.style == 'spectrogram':
+            self.queue_draw()
+
+    def set_points(self, points):
+        if points is not None and len(points) > 0:
+            if np.ndim(points) == 2:
+                points, self.peaks = points
             else:
-                image = Image.open(image_input)
+                self.peaks = None
+            self.points = points
+            if self.style == 'spectrogram':
+                self.spectrogram.push(points)
+                self.queue_draw()
+            elif self.rasterizer:
+                self.submit_frame()
+            else:
+                self.queue_draw()
 
-            image = image.resize((150, 150))
-            image = image.convert('RGB')
+    def set_color(self, r, g, b, a=0.8):
+        self.renderer.set_color(r, g, b, a)
+        if self.rasterizer:
+            self.submit_frame()
+        else:
+            self.queue_draw()
+
+    def on_draw(self, widget, cr):
+        allocation = widget.get_allocation()
+
+        if self.style == 'spectrogram':
+            self.spectrogram.draw(cr, allocation.width, allocation.height)
+            return False
 
-            colors = image.getcolors(maxcolors=256*256*256)
-            if not colors:
-                return [(0.2, 0.3, 0.5), (0.4, 0.5, 0.7), (0.6, 0.7, 0.9)]
+        if self.rasterizer:
+            self.drawn_generation = self.rasterizer.generation
+            scale = self.get_scale_factor()
+            surface = self.rasterizer.surfaces[self.rasterizer.front]
+            if (surface is None or surface.get_width() != allocation.width * scale or
+                    surface.get_height() != allocation.height * scale):
+                self.submit_frame()
+            self.rasterizer.blit(cr)
+            return False
 
-            colors.sort(key=lambda x: x[0], reverse=True)
+        self.renderer.draw(cr, allocation.width, allocation.height, self.points, self.peaks)
+        return False
 
-            dominant_colors = []
-            for count, color in colors[:num_colors]:
-                r, g, b = [c/255.0 for c in color]
-                dominant_colors.append((r, g, b))
+class ColorExtractor:
+    DEFAULT_COLORS = [(0.2, 0.3, 0.5), (0.4, 0.5, 0.7), (0.6, 0.7, 0.9)]
 
-            return dominant_colors
+    @staticmethod
+    def open_image(image_input, fetcher=None):
+        if isinstance(image_input, str):
+            if image_input.startswith('http'):
+                response = (fetcher or ArtworkFetcher.shared()).get(image_input)
+                return Image.open(io.BytesIO(response['content']))
+            return Image.open(image_input)
+        elif isinstance(image_input, (io.BytesIO, io.BufferedReader)):
+            image_input.seek(0)
+            return Image.open(image_input)
+        elif isinstance(image_input, Image.Image):
+            return image_input
+        return Image.open(image_input)
+
+    @staticmethod
+    def get_dominant_colors(image_input, num_colors=3, fetcher=None):
+        try:
+            image = ColorExtractor.open_image(image_input, fetcher)
+            return ColorExtractor.palette_from_image(image, num_colors)
 
         except Exception as e:
             print(f"Error extracting colors: {e}")
-            return [(0.2, 0.3, 0.5), (0.4, 0.5, 0.7), (0.6, 0.7, 0.9)]
+            return list(ColorExtractor.DEFAULT_COLORS)
+
+    @staticmethod
+    def palette_from_image(image, num_colors=3, size=64, bits=5, min_distance=0.18):
+        if image.format == 'JPEG':
+            image.draft('RGB', (size, size))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        if image.width > size or image.height > size:
+            image = image.resize((size, size), Image.BILINEAR, reducing_gap=2.0)
+
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 3)
+        if len(pixels) == 0:
+            return list(ColorExtractor.DEFAULT_COLORS)
+
+        shift = 8 - bits
+        quantized = (pixels >> shift).astype(np.int32)
+        keys = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+
+        bins = 1 << (3 * bits)
+        counts = np.bincount(keys, minlength=bins)
+        sums = np.stack([np.bincount(keys, weights=pixels[:, c], minlength=bins) for c in range(3)], axis=1)
+
+        occupied = np.flatnonzero(counts)
+        order = occupied[np.argsort(counts[occupied])[::-1]][:256]
+        candidates = sums[order] / counts[order, None] / 255.0
+
+        selected = []
+        for color in candidates:
+            if all(np.linalg.norm(color - chosen) >= min_distance for chosen in selected):
+                selected.append(color)
+                if len(selected) == num_colors:
+                    break
+
+        for color in candidates:
+            if len(selected) == num_colors:
+                break
+            if not any(np.array_equal(color, chosen) for chosen in selected):
+                selected.append(color)
+
+        dominant_colors = [tuple(float(c) for c in color) for color in selected]
+        while len(dominant_colors) < num_colors:
+            dominant_colors.append(ColorExtractor.DEFAULT_COLORS[len(dominant_colors) % 3])
+        return dominant_colors
 
     @staticmethod
     def generate_color_scheme(dominant_colors):
@@ -329,6 +1092,819 @@ class ColorExtractor:
             'text': (1.0, 1.0, 1.0)
         }
 
+class ArtworkCache:
+    def __init__(self, max_bytes=200 * 1024 * 1024, root=None, default_max_age=7 * 24 * 3600):
+        if root is None:
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+            root = os.path.join(cache_home, 'ecliptic', 'artwork')
+        self.root = root
+        self.max_bytes = max_bytes
+        self.default_max_age = default_max_age
+        self.lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key_for_url(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def key_for_data(data):
+        return hashlib.sha1(data).hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def path(self, key, name):
+        return os.path.join(self.entry_dir(key), name)
+
+    def read(self, key, name):
+        try:
+            with open(self.path(key, name), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write(self, key, name, data):
+        os.makedirs(self.entry_dir(key), exist_ok=True)
+        target = self.path(key, name)
+        temp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, target)
+
+    def read_meta(self, key):
+        data = self.read(key, 'meta.json')
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def write_meta(self, key, meta):
+        self.write(key, 'meta.json', json.dumps(meta).encode())
+
+    def touch(self, key):
+        try:
+            os.utime(self.path(key, 'meta.json'))
+        except OSError:
+            pass
+
+    def is_fresh(self, meta):
+        max_age = meta.get('max_age', self.default_max_age)
+        return time.time() - meta.get('checked', 0) < max_age
+
+    def store_source(self, key, data, meta):
+        entry = self.entry_dir(key)
+        if os.path.isdir(entry):
+            for name in os.listdir(entry):
+                if name != 'meta.json':
+                    os.remove(os.path.join(entry, name))
+        if data is not None:
+            self.write(key, 'source', data)
+        self.write_meta(key, meta)
+
+    def load_image(self, key, name):
+        data = self.read(key, name)
+        if data is None:
+            return None
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            return image
+        except Exception:
+            return None
+
+    def store_image(self, key, name, image):
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', compress_level=1)
+        self.write(key, name, buffer.getvalue())
+
+    def load_palette(self, key):
+        data = self.read(key, 'palette.json')
+        if data is None:
+            return None
+        try:
+            return [tuple(color) for color in json.loads(data)]
+        except ValueError:
+            return None
+
+    def store_palette(self, key, colors):
+        self.write(key, 'palette.json', json.dumps([list(color) for color in colors]).encode())
+
+    def evict(self):
+        with self.lock:
+            entries = []
+            total = 0
+            for bucket in os.scandir(self.root):
+                if not bucket.is_dir():
+                    continue
+                try:
+                    bucket_entries = list(os.scandir(bucket.path))
+                except OSError:
+                    continue
+                for entry in bucket_entries:
+                    size = 0
+                    last_used = 0
+                    try:
+                        items = list(os.scandir(entry.path))
+                    except OSError:
+                        continue
+                    for item in items:
+                        if item.name.endswith('.tmp'):
+                            continue
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        size += stat.st_size
+                        if item.name == 'meta.json':
+                            last_used = stat.st_mtime
+                    entries.append((last_used, size, entry.path))
+                    total += size
+
+            entries.sort()
+            for last_used, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self.remove_entry(path)
+                total -= size
+
+            for bucket in os.scandir(self.root):
+                if bucket.is_dir():
+                    try:
+                        os.rmdir(bucket.path)
+                    except OSError:
+                        pass
+
+    def remove_entry(self, path):
+        try:
+            items = list(os.scandir(path))
+        except OSError:
+            return
+        for item in items:
+            if item.name.endswith('.tmp'):
+                continue
+            try:
+                os.remove(item.path)
+            except OSError:
+                pass
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+
+class ArtworkMemoryCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def artwork_size(artwork):
+        size = 0
+        pixbuf = artwork.get('pixbuf')
+        if pixbuf is not None:
+            size += pixbuf.get_rowstride() * pixbuf.get_height()
+        for rendition in artwork.get('renditions', {}).values():
+            size += rendition.get_rowstride() * rendition.get_height()
+        background = artwork.get('background')
+        if background is not None:
+            size += background.get_stride() * background.get_height()
+        return size
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def contains(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def put(self, key, artwork):
+        size = self.artwork_size(artwork)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (artwork, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+class ArtworkCancelled(Exception):
+    pass
+
+class ArtworkLoader:
+    def __init__(self, pipeline, workers=2, memory_cache=None):
+        self.pipeline = pipeline
+        self.memory_cache = memory_cache
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.cancelled = 0
+        self.completed = 0
+
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def submit(self, art_url, on_done, on_error, **options):
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+        self.jobs.put((generation, art_url, options, on_done, on_error))
+        return generation
+
+    def cancel(self):
+        with self.lock:
+            self.generation += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                'queue_depth': self.jobs.qsize(),
+                'cancelled': self.cancelled,
+                'completed': self.completed
+            }
+
+    def _count_cancelled(self):
+        with self.lock:
+            self.cancelled += 1
+
+    def _worker(self):
+        while True:
+            generation, art_url, options, on_done, on_error = self.jobs.get()
+
+            def cancelled():
+                return generation != self.generation
+
+            try:
+                if cancelled():
+                    raise ArtworkCancelled(art_url)
+                artwork = self.pipeline.process(art_url, cancelled=cancelled, **options)
+                if artwork and self.memory_cache:
+                    self.memory_cache.put(ArtworkPipeline.rendition_key(art_url, **options), artwork)
+                GLib.idle_add(self._deliver, generation, on_done, artwork)
+            except ArtworkCancelled:
+                self._count_cancelled()
+            except Exception as e:
+                GLib.idle_add(self._deliver, generation, on_error, e)
+
+    def _deliver(self, generation, callback, result):
+        if generation != self.generation:
+            self._count_cancelled()
+            return False
+        with self.lock:
+            self.completed += 1
+        callback(result)
+        return False
+
+class ArtworkFetchError(requests.RequestException):
+    pass
+
+class ArtworkFetcher:
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    shared_instance = None
+    shared_lock = threading.Lock()
+
+    def __init__(self, max_per_host=2, connect_timeout=3.0, deadline=10.0, max_bytes=20 * 1024 * 1024):
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = self.USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=max_per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.lock = threading.Lock()
+        self.host_slots = {}
+        self.inflight = {}
+        self.requests_made = 0
+        self.coalesced = 0
+
+    @classmethod
+    def shared(cls):
+        if cls.shared_instance is None:
+            with cls.shared_lock:
+                if cls.shared_instance is None:
+                    cls.shared_instance = cls()
+        return cls.shared_instance
+
+    def get(self, url, headers=None):
+        key = (url, tuple(sorted((headers or {}).items())))
+        with self.lock:
+            download = self.inflight.get(key)
+            leader = download is None
+            if leader:
+                download = {'done': threading.Event(), 'result': None, 'error': None}
+                self.inflight[key] = download
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            download['done'].wait()
+            if download['error']:
+                raise download['error']
+            return download['result']
+
+        try:
+            download['result'] = self._download(url, headers or {})
+            return download['result']
+        except Exception as e:
+            download['error'] = e
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[key]
+            download['done'].set()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': self.requests_made,
+                'coalesced': self.coalesced,
+                'inflight': len(self.inflight)
+            }
+
+    def _host_slot(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.host_slots[host]
+
+    def _remaining(self, deadline, url):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ArtworkFetchError(f"Deadline of {self.deadline}s exceeded for {url}")
+        return remaining
+
+    def _download(self, url, headers):
+        deadline = time.monotonic() + self.deadline
+        slot = self._host_slot(url)
+        if not slot.acquire(timeout=self._remaining(deadline, url)):
+            raise ArtworkFetchError(f"Deadline of {self.deadline}s exceeded waiting for {url}")
+
+        try:
+            with self.lock:
+                self.requests_made += 1
+            remaining = self._remaining(deadline, url)
+            with self.session.get(url, headers=headers, stream=True,
+                                  timeout=(min(self.connect_timeout, remaining), remaining)) as response:
+                if response.status_code >= 400:
+                    raise ArtworkFetchError(f"HTTP {response.status_code} for {url}", response=response)
+
+                length = response.headers.get('Content-Length')
+                if length and length.isdigit() and int(length) > self.max_bytes:
+                    raise ArtworkFetchError(f"Artwork too large ({length} bytes) at {url}")
+
+                content = bytearray()
+                for chunk in response.iter_content(8 * 1024):
+                    content += chunk
+                    if len(content) > self.max_bytes:
+                        raise ArtworkFetchError(f"Artwork larger than {self.max_bytes} bytes at {url}")
+                    self._remaining(deadline, url)
+
+                return {
+                    'status': response.status_code,
+                    'headers': response.headers,
+                    'content': bytes(content)
+                }
+        finally:
+            slot.release()
+
+class TrackPrefetcher:
+    def __init__(self, pipeline, memory_cache):
+        self.pipeline = pipeline
+        self.memory_cache = memory_cache
+        self.condition = threading.Condition()
+        self.pending = None
+        self.generation = 0
+        self.prefetched = 0
+
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def request(self, resolve, **options):
+        with self.condition:
+            self.generation += 1
+            self.pending = (self.generation, resolve, options)
+            self.condition.notify()
+
+    def _worker(self):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                generation, resolve, options = self.pending
+                self.pending = None
+
+            def cancelled():
+                return generation != self.generation
+
+            try:
+                art_url = resolve()
+                if not art_url:
+                    continue
+                memory_key = ArtworkPipeline.rendition_key(art_url, **options)
+                if self.memory_cache.contains(memory_key):
+                    continue
+                artwork = self.pipeline.process(art_url, cancelled=cancelled, **options)
+                if artwork:
+                    self.memory_cache.put(memory_key, artwork)
+                    self.prefetched += 1
+                    print(f"Prefetched artwork for upcoming track: {art_url}")
+            except ArtworkCancelled:
+                pass
+            except Exception as e:
+                print(f"Error prefetching artwork: {e}")
+
+class EmbeddedArtwork:
+    SCHEME = 'embedded://'
+    shared_instance = None
+    shared_lock = threading.Lock()
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        if cls.shared_instance is None:
+            with cls.shared_lock:
+                if cls.shared_instance is None:
+                    cls.shared_instance = cls()
+        return cls.shared_instance
+
+    @staticmethod
+    def digest(data, sample=16 * 1024):
+        hasher = hashlib.sha1(str(len(data)).encode('ascii'))
+        hasher.update(data[:sample])
+        hasher.update(data[-sample:])
+        return hasher.hexdigest()
+
+    def register(self, data, digest=None):
+        key = digest or self.digest(data)
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = data
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return self.SCHEME + key
+
+    def get(self, art_url):
+        key = art_url[len(self.SCHEME):]
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+            return data
+
+class ArtworkIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.track_covers = {}
+        self.cover_tracks = {}
+        self.cover_sizes = {}
+        self.generation = 0
+
+    def build(self, tracks, extract_art):
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            self.track_covers = {}
+            self.cover_tracks = {}
+            self.cover_sizes = {}
+
+        def build_thread():
+            started = time.perf_counter()
+            for track in tracks:
+                if generation != self.generation:
+                    return
+                try:
+                    art_data = extract_art(mutagen.File(str(track)))
+                except Exception:
+                    art_data = None
+                if art_data:
+                    self.add(track, art_data)
+
+            stats = self.stats()
+            print(f"Artwork index: {stats['tracks']} tracks share {stats['covers']} covers, "
+                  f"{stats['duplicate_bytes'] / (1024 * 1024):.1f} MB of duplicates "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+        threading.Thread(target=build_thread, daemon=True).start()
+
+    def add(self, track, art_data):
+        digest = EmbeddedArtwork.digest(art_data)
+        with self.lock:
+            self.track_covers[str(track)] = digest
+            self.cover_tracks.setdefault(digest, []).append(str(track))
+            self.cover_sizes[digest] = len(art_data)
+        return digest
+
+    def cover_for(self, track):
+        with self.lock:
+            return self.track_covers.get(str(track))
+
+    def tracks_for(self, digest):
+        with self.lock:
+            return list(self.cover_tracks.get(digest, []))
+
+    def stats(self):
+        with self.lock:
+            return {
+                'tracks': len(self.track_covers),
+                'covers': len(self.cover_tracks),
+                'duplicate_bytes': sum(
+                    self.cover_sizes[digest] * (len(tracks) - 1)
+                    for digest, tracks in self.cover_tracks.items()
+                )
+            }
+
+class ArtworkPipeline:
+    def __init__(self, art_size=400, background_size=(520, 810), cache=None, fetcher=None, embedded=None):
+        self.art_size = art_size
+        self.background_size = background_size
+        self.background_blur_factor = 4
+        self.cache = cache
+        self.fetcher = fetcher or ArtworkFetcher.shared()
+        self.embedded = embedded or EmbeddedArtwork.shared()
+
+    def fetch(self, art_url):
+        if art_url.startswith(EmbeddedArtwork.SCHEME):
+            image_data = self.embedded.get(art_url)
+            if image_data is None:
+                print(f"Embedded artwork no longer available: {art_url}")
+            return image_data
+        elif art_url.startswith('file://'):
+            file_path = art_url[7:]
+            if not os.path.exists(file_path):
+                print(f"Local file not found: {file_path}")
+                return None
+            with open(file_path, 'rb') as f:
+                return f.read()
+        elif art_url.startswith(('http://', 'https://')):
+            return self.fetcher.get(art_url)['content']
+        elif os.path.exists(art_url):
+            with open(art_url, 'rb') as f:
+                return f.read()
+
+        print(f"Unsupported URL format or file not found: {art_url}")
+        return None
+
+    def fetch_cached(self, art_url):
+        if art_url.startswith(EmbeddedArtwork.SCHEME):
+            key = art_url[len(EmbeddedArtwork.SCHEME):]
+            if self.cache.read_meta(key) is not None:
+                return key, self.embedded.get(art_url)
+
+        if not art_url.startswith(('http://', 'https://')):
+            image_data = self.fetch(art_url)
+            if not image_data:
+                return None, None
+            if art_url.startswith(EmbeddedArtwork.SCHEME):
+                key = art_url[len(EmbeddedArtwork.SCHEME):]
+            else:
+                key = ArtworkCache.key_for_data(image_data)
+            if self.cache.read_meta(key) is None:
+                self.cache.store_source(key, None, {'url': art_url, 'checked': time.time()})
+            return key, image_data
+
+        key = ArtworkCache.key_for_url(art_url)
+        meta = self.cache.read_meta(key)
+        if meta and self.cache.is_fresh(meta):
+            return key, None
+
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            response = self.fetcher.get(art_url, headers)
+        except requests.RequestException as e:
+            if meta:
+                print(f"Using cached artwork, network unavailable: {e}")
+                return key, None
+            raise
+
+        if response['status'] == 304 and meta:
+            meta['checked'] = time.time()
+            self.cache.write_meta(key, meta)
+            return key, None
+
+        meta = {
+            'url': art_url,
+            'etag': response['headers'].get('ETag'),
+            'last_modified': response['headers'].get('Last-Modified'),
+            'checked': time.time()
+        }
+        cache_control = response['headers'].get('Cache-Control', '')
+        for directive in cache_control.split(','):
+            name, _, value = directive.strip().partition('=')
+            if name == 'max-age' and value.isdigit():
+                meta['max_age'] = int(value)
+            elif name == 'no-cache':
+                meta['max_age'] = 0
+
+        self.cache.store_source(key, response['content'], meta)
+        return key, response['content']
+
+    @staticmethod
+    def rendition_key(art_url, scale=1, extra_sizes=(), with_palette=True):
+        return (art_url, scale, tuple(extra_sizes), bool(with_palette))
+
+    def decode(self, image_data, scale=1):
+        image = Image.open(io.BytesIO(image_data))
+        if image.format == 'JPEG':
+            largest = scale * max(self.art_size, *[side // self.background_blur_factor for side in self.background_size])
+            image.draft('RGB', (largest, largest))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.load()
+        return image
+
+    def pixbuf_from_image(self, image):
+        width, height = image.size
+        return GdkPixbuf.Pixbuf.new_from_bytes(
+            GLib.Bytes.new(image.tobytes()),
+            GdkPixbuf.Colorspace.RGB,
+            False, 8, width, height, width * 3
+        )
+
+    def surface_from_image(self, image):
+        width, height = image.size
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, width, height)
+        stride = surface.get_stride()
+
+        buf_array = np.ndarray(shape=(height, stride), dtype=np.uint8, buffer=surface.get_data())
+        buf_array[:, :width * 4] = np.frombuffer(
+            image.tobytes('raw', 'BGRX'), dtype=np.uint8
+        ).reshape(height, width * 4)
+
+        surface.mark_dirty()
+        return surface
+
+    def create_thumbnail(self, image, size=None):
+        size = size or self.art_size
+        return image.resize((size, size), Image.BILINEAR)
+
+    def create_background(self, image, scale=1):
+        target_width, target_height = (side * scale for side in self.background_size)
+
+        img_ratio = image.width / image.height
+        target_ratio = target_width / target_height
+
+        if img_ratio > target_ratio:
+            new_height = image.height
+            new_width = int(new_height * target_ratio)
+            left = (image.width - new_width) // 2
+            image = image.crop((left, 0, left + new_width, new_height))
+        else:
+            new_width = image.width
+            new_height = int(new_width / target_ratio)
+            top = (image.height - new_height) // 3
+            image = image.crop((0, top, new_width, top + new_height))
+
+        factor = self.background_blur_factor
+        small_size = (max(1, target_width // factor), max(1, target_height // factor))
+        image = image.resize(small_size, Image.BILINEAR, reducing_gap=2.0)
+
+        image = image.filter(ImageFilter.GaussianBlur(radius=15 * scale / factor))
+        image = image.point(lambda value: int(value * 0.7))
+
+        return image.resize((target_width, target_height), Image.BILINEAR)
+
+    def process(self, art_url, with_palette=True, cancelled=None, scale=1, extra_sizes=()):
+        timings = {}
+        started = time.perf_counter()
+
+        def check_cancelled():
+            if cancelled and cancelled():
+                raise ArtworkCancelled(art_url)
+
+        def lap(stage):
+            nonlocal started
+            now = time.perf_counter()
+            timings[stage] = (now - started) * 1000
+            started = now
+
+        key = None
+        thumbnail_sizes = [size * scale for size in (self.art_size, *extra_sizes)]
+        thumbnails = dict.fromkeys(thumbnail_sizes)
+        background_name = "background-{}x{}.png".format(*(side * scale for side in self.background_size))
+        background = dominant_colors = None
+
+        def missing():
+            return (None in thumbnails.values() or background is None
+                    or (with_palette and dominant_colors is None))
+
+        if self.cache:
+            key, image_data = self.fetch_cached(art_url)
+            lap('fetch')
+            if key:
+                for size in thumbnail_sizes:
+                    thumbnails[size] = self.cache.load_image(key, f"thumbnail-{size}.png")
+                background = self.cache.load_image(key, background_name)
+                if with_palette:
+                    dominant_colors = self.cache.load_palette(key)
+                lap('cache')
+                if image_data is None and missing():
+                    image_data = self.cache.read(key, 'source')
+                    if image_data is None:
+                        image_data = self.fetch(art_url)
+        else:
+            image_data = self.fetch(art_url)
+            lap('fetch')
+
+        image = None
+
+        def decoded():
+            nonlocal image
+            if image is None:
+                check_cancelled()
+                image = self.decode(image_data, scale)
+                lap('decode')
+            return image
+
+        if missing() and not image_data:
+            print(f"No image data loaded from: {art_url}")
+            return None
+
+        for size in thumbnail_sizes:
+            if thumbnails[size] is None:
+                check_cancelled()
+                thumbnails[size] = self.create_thumbnail(decoded(), size)
+                lap(f'thumbnail {size}')
+                if key:
+                    self.cache.store_image(key, f"thumbnail-{size}.png", thumbnails[size])
+
+        if background is None:
+            check_cancelled()
+            background = self.create_background(decoded(), scale)
+            lap('background')
+            if key:
+                self.cache.store_image(key, background_name, background)
+
+        color_scheme = None
+        if with_palette:
+            if dominant_colors is None:
+                check_cancelled()
+                dominant_colors = ColorExtractor.palette_from_image(decoded())
+                lap('palette')
+                if key:
+                    self.cache.store_palette(key, dominant_colors)
+            color_scheme = ColorExtractor.generate_color_scheme(dominant_colors)
+
+        pixbuf = self.pixbuf_from_image(thumbnails[thumbnail_sizes[0]])
+        renditions = {
+            size: self.pixbuf_from_image(thumbnails[size * scale])
+            for size in extra_sizes
+        }
+        background_surface = self.surface_from_image(background)
+        lap('convert')
+
+        if key:
+            self.cache.touch(key)
+            if image is not None:
+                self.cache.evict()
+
+        print("Artwork ready in {:.0f} ms ({})".format(
+            sum(timings.values()),
+            ", ".join(f"{stage} {ms:.0f}" for stage, ms in timings.items())
+        ))
+
+        return {
+            'pixbuf': pixbuf,
+            'renditions': renditions,
+            'scale': scale,
+            'background': background_surface,
+            'color_scheme': color_scheme,
+            'timings': timings
+        }
+
 class Config:
     def __init__(self):
         self.panel_icon = "view-media-track"
@@ -349,7 +1925,19 @@ class Config:
         self.text_scrolling_enabled = True
         self.text_scrolling_reset_on_pause = False
         self.volume_step = 5
+        self.position_resync_interval = 5
+        self.dbus_call_timeout = 2.0
+        self.dbus_seed_timeout = 10.0
         self.colors_from_album_cover = True
+        self.artwork_cache_enabled = True
+        self.artwork_cache_max_mb = 200
+        self.artwork_memory_cache_mb = 64
+        self.artwork_workers = 2
+        self.prefetch_next_track = True
+        self.artwork_extra_sizes = []
+        self.artwork_fetch_per_host = 2
+        self.artwork_fetch_deadline = 10
+        self.artwork_max_download_mb = 20
         self.panel_background_radius = 8
         self.fill_available_space = False
         self.panel_icon_size_ratio = 0.75
@@ -364,12 +1952,96 @@ class Config:
         self.no_media_text = "No media found"
         self.show_when_no_media = True
         self.visualizer_enabled = True
+        self.visualizer_peak_hold = False
+        self.visualizer_auto_gain = False
+        self.visualizer_gravity = False
+        self.visualizer_local_spectrum = False
+        self.visualizer_threaded_render = False
+        self.visualizer_style = "wave"
+
+class PositionClock:
+    def __init__(self, position=0, rate=1.0, status='Stopped'):
+        self.position = int(position)
+        self.rate = float(rate)
+        self.status = str(status)
+        self.synced = time.monotonic()
+        self.needs_sync = False
+
+    def sync(self, position):
+        self.position = int(position)
+        self.synced = time.monotonic()
+        self.needs_sync = False
+
+    def update(self, rate=None, status=None):
+        self.position = self.position_at()
+        self.synced = time.monotonic()
+        if rate is not None:
+            self.rate = float(rate)
+        if status is not None:
+            self.status = str(status)
+        self.needs_sync = True
+
+    def position_at(self, now=None):
+        if self.status != 'Playing':
+            return self.position
+        elapsed = (now or time.monotonic()) - self.synced
+        return self.position + int(elapsed * self.rate * 1000000)
+
+    def age(self):
+        return time.monotonic() - self.synced
+
+class PlayerHandle:
+    ACTION_CAPABILITIES = {
+        'PlayPause': 'CanPause',
+        'Play': 'CanPlay',
+        'Pause': 'CanPause',
+        'Next': 'CanGoNext',
+        'Previous': 'CanGoPrevious',
+        'Seek': 'CanSeek',
+        'SetPosition': 'CanSeek'
+    }
+
+    def __init__(self, bus, bus_name, owner):
+        self.bus_name = bus_name
+        self.owner = owner
+        self.name = bus_name.split('.')[-1]
+        self.proxy = bus.get_object(bus_name, '/org/mpris/MediaPlayer2', introspect=False)
+        self.props = dbus.Interface(self.proxy, 'org.freedesktop.DBus.Properties')
+        self.player = dbus.Interface(self.proxy, 'org.mpris.MediaPlayer2.Player')
+        self.tracklist = dbus.Interface(self.proxy, 'org.mpris.MediaPlayer2.TrackList')
+        self.state = {}
+        self.seeded = False
+        self.seed_retry_id = None
+        self.clock = PositionClock()
+        self.has_tracklist = False
+        self.unsupported = set()
+        self.sync_pending = False
+        self.latency = {'calls': 0, 'errors': 0, 'timeouts': 0, 'pending': 0, 'avg_ms': 0.0, 'max_ms': 0.0}
+
+    def seed(self, properties):
+        self.seeded = True
+        self.state = dict(properties)
+        self.clock = PositionClock(
+            self.state.get('Position', 0), self.state.get('Rate', 1.0), self.state.get('PlaybackStatus', 'Stopped')
+        )
+
+    def can(self, action):
+        if not self.seeded or not self.state.get('CanControl', True) or action in self.unsupported:
+            return False
+        capability = self.ACTION_CAPABILITIES.get(action)
+        return capability is None or bool(self.state.get(capability, True))
+
+    def can_set(self, name):
+        if not self.state.get('CanControl', True) or name in self.unsupported:
+            return False
+        return name in self.state
 
 class MediaController:
     def __init__(self, config):
         self.config = config
         self.current_player = None
         self.players = {}
+        self.owners = {}
         self.last_error_time = 0
         self.error_cooldown = 5
 
@@ -398,7 +2070,16 @@ class MediaController:
                 self.on_properties_changed,
                 signal_name='PropertiesChanged',
                 dbus_interface='org.freedesktop.DBus.Properties',
-                path='/org/mpris/MediaPlayer2'
+                path='/org/mpris/MediaPlayer2',
+                sender_keyword='sender'
+            )
+
+            self.bus.add_signal_receiver(
+                self.on_seeked,
+                signal_name='Seeked',
+                dbus_interface='org.mpris.MediaPlayer2.Player',
+                path='/org/mpris/MediaPlayer2',
+                sender_keyword='sender'
             )
 
             self.bus.add_signal_receiver(
@@ -440,17 +2121,50 @@ class MediaController:
             return
 
         try:
-            player_obj = self.bus.get_object(bus_name, '/org/mpris/MediaPlayer2')
+            handle = PlayerHandle(self.bus, bus_name, self.bus.get_name_owner(bus_name))
+        except Exception as e:
+            self.log_error(f"Failed to add player {bus_name}: {e}")
+            return
 
-            props = dbus.Interface(player_obj, 'org.freedesktop.DBus.Properties')
-            props.Get('org.mpris.MediaPlayer2', 'Identity')
+        previous = self.players.get(bus_name)
+        if previous:
+            self.owners.pop(previous.owner, None)
+        self.players[bus_name] = handle
+        self.owners[handle.owner] = bus_name
+        self.seed_player(handle)
 
-            self.players[bus_name] = player_obj
-            player_name = bus_name.split('.')[-1]
-            print(f"Added player: {player_name}")
+    def seed_player(self, handle, retry_delay=1):
+        if self.players.get(handle.bus_name) is not handle or handle.seeded:
+            return False
 
-        except Exception as e:
-            self.log_error(f"Failed to add player {bus_name}: {e}")
+        def on_state(properties):
+            handle.seed(properties)
+            print(f"Added player: {handle.name}")
+
+        def on_root_state(properties):
+            handle.has_tracklist = bool(properties.get('HasTrackList', False))
+
+        def on_error(error):
+            if "ServiceUnknown" in str(error):
+                self.handle_dbus_error(handle, error)
+                return
+            if handle.seed_retry_id:
+                return
+            self.log_error(f"Player {handle.name} not ready, retrying in {retry_delay}s: {error}")
+
+            def retry():
+                handle.seed_retry_id = None
+                self.seed_player(handle, min(retry_delay * 2, 30))
+                return False
+
+            handle.seed_retry_id = GLib.timeout_add_seconds(retry_delay, retry)
+
+        timeout = self.config.dbus_seed_timeout
+        self.call_async(handle, handle.props.GetAll, 'org.mpris.MediaPlayer2',
+                        on_reply=on_root_state, on_error=lambda error: None, timeout=timeout)
+        self.call_async(handle, handle.props.GetAll, 'org.mpris.MediaPlayer2.Player',
+                        on_reply=on_state, on_error=on_error, timeout=timeout)
+        return False
 
     def on_name_owner_changed(self, name, old_owner, new_owner):
         if name.startswith('org.mpris.MediaPlayer2.'):
@@ -459,79 +2173,154 @@ class MediaController:
                 if not self.current_player or self.config.choose_player_automatically:
                     self.current_player = name
             elif old_owner and name in self.players:
-                del self.players[name]
-                if self.current_player == name:
-                    self.current_player = next(iter(self.players), None)
+                self.remove_player(name)
+
+    def remove_player(self, bus_name):
+        handle = self.players.pop(bus_name, None)
+        if handle:
+            self.owners.pop(handle.owner, None)
+            if handle.seed_retry_id:
+                GLib.source_remove(handle.seed_retry_id)
+                handle.seed_retry_id = None
+        if self.current_player == bus_name:
+            self.current_player = next(iter(self.players), None)
+
+    def current_handle(self):
+        if not self.bus or not self.current_player:
+            return None
+        return self.players.get(self.current_player)
 
-    def on_properties_changed(self, interface, changed_properties, invalidated_properties):
-        pass
+    def on_properties_changed(self, interface, changed_properties, invalidated_properties, sender=None):
+        if interface != 'org.mpris.MediaPlayer2.Player':
+            return
 
-    def safe_dbus_call(self, func, *args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except dbus.exceptions.DBusException as e:
-            if "ServiceUnknown" in str(e):
-                if self.current_player in self.players:
-                    del self.players[self.current_player]
-                    self.current_player = next(iter(self.players), None)
-                    self.discover_players()
+        handle = self.players.get(self.owners.get(sender))
+        if handle is None:
+            return
+
+        handle.state.update(changed_properties)
+
+        clock = handle.clock
+        if 'Metadata' in changed_properties:
+            clock.sync(0)
+            clock.needs_sync = True
+        if 'PlaybackStatus' in changed_properties or 'Rate' in changed_properties:
+            clock.update(changed_properties.get('Rate'), changed_properties.get('PlaybackStatus'))
+
+        for name in invalidated_properties:
+            def on_value(value, name=name):
+                handle.state[name] = value
+                if name in ('PlaybackStatus', 'Rate'):
+                    clock.update(handle.state.get('Rate'), handle.state.get('PlaybackStatus'))
+
+            self.call_async(handle, handle.props.Get, 'org.mpris.MediaPlayer2.Player', name, on_reply=on_value)
+
+    def on_seeked(self, position, sender=None):
+        handle = self.players.get(self.owners.get(sender))
+        if handle is not None:
+            handle.clock.sync(position)
+
+    def sync_position(self, handle):
+        if handle.sync_pending:
+            return
+        handle.sync_pending = True
+
+        def on_position(position):
+            handle.sync_pending = False
+            handle.clock.sync(position)
+
+        def on_error(error):
+            handle.sync_pending = False
+            self.handle_dbus_error(handle, error)
+
+        self.call_async(handle, handle.props.Get, 'org.mpris.MediaPlayer2.Player', 'Position',
+                        on_reply=on_position, on_error=on_error)
+
+    def call_async(self, handle, method, *args, on_reply=None, on_error=None, timeout=None, signature=None):
+        stats = handle.latency
+        started = time.monotonic()
+
+        def finish():
+            elapsed = (time.monotonic() - started) * 1000
+            stats['pending'] -= 1
+            stats['calls'] += 1
+            stats['avg_ms'] += (elapsed - stats['avg_ms']) / stats['calls']
+            stats['max_ms'] = max(stats['max_ms'], elapsed)
+
+        def reply_handler(*result):
+            finish()
+            if on_reply:
+                on_reply(*result)
+
+        def error_handler(error):
+            finish()
+            stats['errors'] += 1
+            if error.get_dbus_name() == 'org.freedesktop.DBus.Error.NoReply':
+                stats['timeouts'] += 1
+            if on_error:
+                on_error(error)
             else:
-                self.log_error(f"D-Bus call failed: {e}")
-            return None
+                self.handle_dbus_error(handle, error)
+
+        options = {'signature': signature} if signature else {}
+        stats['pending'] += 1
+        try:
+            method(*args, reply_handler=reply_handler, error_handler=error_handler,
+                   timeout=timeout or self.config.dbus_call_timeout, **options)
         except Exception as e:
+            stats['pending'] -= 1
             self.log_error(f"Unexpected error in D-Bus call: {e}")
-            return None
+
+    def handle_dbus_error(self, handle, error):
+        if "ServiceUnknown" in str(error):
+            if handle.bus_name in self.players:
+                self.remove_player(handle.bus_name)
+                self.discover_players()
+        else:
+            self.log_error(f"D-Bus call failed: {error}")
+
+    def latency_stats(self):
+        return {bus_name: dict(handle.latency) for bus_name, handle in self.players.items()}
 
     def get_current_track_info(self):
-        if not self.bus or not self.current_player or self.current_player not in self.players:
+        handle = self.current_handle()
+        if handle is None:
             return None
 
         try:
-            player = self.players[self.current_player]
-            props = dbus.Interface(player, 'org.freedesktop.DBus.Properties')
-
-            metadata = self.safe_dbus_call(
-                props.Get, 'org.mpris.MediaPlayer2.Player', 'Metadata'
-            )
+            state = handle.state
+            metadata = state.get('Metadata')
             if not metadata:
                 return None
 
-            status = self.safe_dbus_call(
-                props.Get, 'org.mpris.MediaPlayer2.Player', 'PlaybackStatus'
-            )
-            if not status:
-                status = 'Stopped'
+            status = state.get('PlaybackStatus') or 'Stopped'
+
+            clock = handle.clock
+            if clock.needs_sync or (status == 'Playing' and clock.age() > self.config.position_resync_interval):
+                self.sync_position(handle)
 
             track_info = {
                 'title': str(metadata.get('xesam:title', 'Unknown Title')),
                 'artist': ', '.join(metadata.get('xesam:artist', ['Unknown Artist'])),
                 'album': str(metadata.get('xesam:album', 'Unknown Album')),
                 'art_url': str(metadata.get('mpris:artUrl', '')),
+                'track_id': str(metadata.get('mpris:trackid', '')),
                 'status': str(status),
                 'length': int(metadata.get('mpris:length', 0)) // 1000000,
             }
 
-            position = self.safe_dbus_call(
-                props.Get, 'org.mpris.MediaPlayer2.Player', 'Position'
-            )
-            track_info['position'] = int(position) // 1000000 if position else 0
+            position = clock.position_at() / 1000000
+            if track_info['length'] > 0:
+                position = min(position, track_info['length'])
+            track_info['position'] = max(0, position)
 
-            try:
-                volume = self.safe_dbus_call(
-                    props.Get, 'org.mpris.MediaPlayer2.Player', 'Volume'
-                )
-                track_info['volume'] = float(volume) if volume is not None else 0.5
-            except:
-                track_info['volume'] = 0.5
+            volume = state.get('Volume')
+            track_info['volume'] = float(volume) if volume is not None else 0.5
 
-            shuffle = self.safe_dbus_call(
-                props.Get, 'org.mpris.MediaPlayer2.Player', 'Shuffle'
-            )
+            shuffle = state.get('Shuffle')
             track_info['shuffle'] = bool(shuffle) if shuffle is not None else False
 
-            loop_status = self.safe_dbus_call(
-                props.Get, 'org.mpris.MediaPlayer2.Player', 'LoopStatus'
-            )
+            loop_status = state.get('LoopStatus')
             track_info['loop_status'] = str(loop_status) if loop_status else 'None'
 
             return track_info
@@ -540,32 +2329,52 @@ class MediaController:
             self.log_error(f"Error getting track info: {e}")
             return None
 
-    def execute_player_action(self, action_name, *args):
-        if not self.bus or not self.current_player or self.current_player not in self.players:
-            print(f"No active player for action: {action_name}")
-            return False
-
-        try:
-            player = self.players[self.current_player]
-            player_interface = dbus.Interface(player, 'org.mpris.MediaPlayer2.Player')
+    def request_next_track_info(self, callback):
+        handle = self.current_handle()
+        if handle is None or not handle.has_tracklist:
+            return
 
-            action_method = getattr(player_interface, action_name)
-            result = self.safe_dbus_call(action_method, *args)
+        metadata = handle.state.get('Metadata') or {}
+        current = metadata.get('mpris:trackid')
+        if current is None:
+            return
 
-            if result is not None or action_name in ['PlayPause', 'Next', 'Previous']:
-                print(f"Executed: {action_name}")
-                return True
-            else:
-                print(f"Action may have failed: {action_name}")
-                return False
+        def on_metadata(result):
+            if not result:
+                return
+            next_metadata = result[0]
+            callback({
+                'title': str(next_metadata.get('xesam:title', 'Unknown Title')),
+                'artist': ', '.join(next_metadata.get('xesam:artist', ['Unknown Artist'])),
+                'album': str(next_metadata.get('xesam:album', 'Unknown Album')),
+                'art_url': str(next_metadata.get('mpris:artUrl', ''))
+            })
+
+        def on_tracks(tracks):
+            tracks = list(tracks)
+            if current not in tracks or tracks.index(current) + 1 >= len(tracks):
+                return
+            self.call_async(handle, handle.tracklist.GetTracksMetadata,
+                            dbus.Array([tracks[tracks.index(current) + 1]], signature='o'),
+                            on_reply=on_metadata)
+
+        self.call_async(handle, handle.props.Get, 'org.mpris.MediaPlayer2.TrackList', 'Tracks',
+                        on_reply=on_tracks)
 
-        except AttributeError:
-            self.log_error(f"Player doesn't support action: {action_name}")
+    def execute_player_action(self, action_name, *args):
+        handle = self.current_handle()
+        if handle is None:
+            print(f"No active player for action: {action_name}")
             return False
-        except Exception as e:
-            self.log_error(f"Error executing {action_name}: {e}")
+
+        if not handle.can(action_name):
+            self.log_error(f"{handle.name} doesn't support action: {action_name}")
             return False
 
+        self.call_async(handle, getattr(handle.player, action_name), *args,
+                        on_reply=lambda *result: print(f"Executed: {action_name}"))
+        return True
+
     def play_pause(self):
         return self.execute_player_action('PlayPause')
 
@@ -575,68 +2384,49 @@ class MediaController:
     def previous_track(self):
         return self.execute_player_action('Previous')
 
-    def set_volume(self, volume):
-        if not self.bus or not self.current_player or self.current_player not in self.players:
+    def set_player_property(self, name, value):
+        handle = self.current_handle()
+        if handle is None or not handle.can_set(name):
             return False
 
-        try:
-            player = self.players[self.current_player]
-            props = dbus.Interface(player, 'org.freedesktop.DBus.Properties')
+        previous = handle.state.get(name)
+        handle.state[name] = value
 
-            try:
-                current_volume = props.Get('org.mpris.MediaPlayer2.Player', 'Volume')
-                result = self.safe_dbus_call(
-                    props.Set, 'org.mpris.MediaPlayer2.Player', 'Volume', dbus.Double(volume)
-            )
-                return result is not None
-            except dbus.exceptions.DBusException as e:
-                if "NotSupported" in str(e) or "Volume" in str(e):
-                    return False
-                else:
-                    raise e
+        def on_error(error):
+            if previous is not None:
+                handle.state[name] = previous
+            if "NotSupported" in str(error):
+                handle.unsupported.add(name)
+            else:
+                self.handle_dbus_error(handle, error)
 
-        except Exception as e:
-            if "NotSupported" not in str(e):
-                self.log_error(f"Error setting volume: {e}")
-            return False
+        self.call_async(handle, handle.props.Set, 'org.mpris.MediaPlayer2.Player', name, value,
+                        on_error=on_error, signature='ssv')
+        return True
+
+    def set_volume(self, volume):
+        return self.set_player_property('Volume', dbus.Double(volume))
 
     def set_position(self, position):
-        if not self.bus or not self.current_player or self.current_player not in self.players:
+        handle = self.current_handle()
+        if handle is None or not handle.can('SetPosition'):
             return False
 
-        try:
-            player = self.players[self.current_player]
-            player_interface = dbus.Interface(player, 'org.mpris.MediaPlayer2.Player')
-
-            props = dbus.Interface(player, 'org.freedesktop.DBus.Properties')
-            metadata = self.safe_dbus_call(props.Get, 'org.mpris.MediaPlayer2.Player', 'Metadata')
-
-            track_id = dbus.ObjectPath('/')
-            if metadata and 'mpris:trackid' in metadata:
-                track_id = metadata['mpris:trackid']
+        metadata = handle.state.get('Metadata') or {}
+        track_id = dbus.ObjectPath(metadata.get('mpris:trackid', '/'))
+        microseconds = dbus.Int64(position * 1000000)
 
-            microseconds = dbus.Int64(position * 1000000)
+        previous = handle.clock.position_at()
+        handle.clock.sync(microseconds)
 
-            result = self.safe_dbus_call(player_interface.SetPosition, track_id, microseconds)
-
-            if result is not None:
-                print(f"Seeked to {position:.1f}s")
-                return True
-            else:
-                current_pos = self.safe_dbus_call(props.Get, 'org.mpris.MediaPlayer2.Player', 'Position')
-                if current_pos is not None:
-                    offset = microseconds - current_pos
-                    result = self.safe_dbus_call(player_interface.Seek, dbus.Int64(offset))
-                    if result is not None:
-                        print("Seeked using relative offset")
-                        return True
-
-                print("Both SetPosition and Seek failed")
-                return False
+        def on_set_position_failed(error):
+            self.call_async(handle, handle.player.Seek, dbus.Int64(microseconds - previous),
+                            on_reply=lambda: print("Seeked using relative offset"))
 
-        except Exception as e:
-            self.log_error(f"Error setting position: {e}")
-            return False
+        self.call_async(handle, handle.player.SetPosition, track_id, microseconds,
+                        on_reply=lambda: print(f"Seeked to {position:.1f}s"),
+                        on_error=on_set_position_failed)
+        return True
 
 class LocalMusicPlayer:
     def __init__(self, callback=None):
@@ -651,6 +2441,12 @@ class LocalMusicPlayer:
         self.duration = 0
         self.volume = 0.5
         self.process = None
+        self.spectrum = None
+        self.tap = None
+        self.metadata_cache = OrderedDict()
+        self.metadata_lock = threading.Lock()
+        self.shuffle_next_index = None
+        self.artwork_index = ArtworkIndex()
         self.supported_formats = ['.mp3', '.flac', '.ogg', '.m4a', '.wav']
 
     def load_directory(self, directory_path):
@@ -663,6 +2459,7 @@ class LocalMusicPlayer:
 
         self.playlist.sort()
         self.current_index = 0
+        self.artwork_index.build(list(self.playlist), self.extract_art)
         print(f"Loaded {len(self.playlist)} music files")
         return len(self.playlist) > 0
 
@@ -679,27 +2476,29 @@ class LocalMusicPlayer:
                 'artist': self._get_tag(audio_file, ['TPE1', 'ARTIST', '\xa9ART']) or 'Unknown Artist',
                 'album': self._get_tag(audio_file, ['TALB', 'ALBUM', '\xa9alb']) or 'Unknown Album',
                 'duration': getattr(audio_file, 'info', {}).length or 0,
-                'art_data': None
+                'art_data': self.extract_art(audio_file)
             }
 
-            if isinstance(audio_file, MP3):
-                for tag in audio_file.tags.values():
-                    if hasattr(tag, 'type') and tag.type == 3:
-                        metadata['art_data'] = tag.data
-                        break
-            elif isinstance(audio_file, FLAC):
-                if audio_file.pictures:
-                    metadata['art_data'] = audio_file.pictures[0].data
-            elif isinstance(audio_file, MP4):
-                if 'covr' in audio_file:
-                    metadata['art_data'] = audio_file['covr'][0]
-
             return metadata
 
         except Exception as e:
             print(f"Error extracting metadata from {file_path}: {e}")
             return self._default_metadata(file_path)
 
+    @staticmethod
+    def extract_art(audio_file):
+        if isinstance(audio_file, MP3):
+            for tag in (audio_file.tags or {}).values():
+                if hasattr(tag, 'type') and tag.type == 3:
+                    return tag.data
+        elif isinstance(audio_file, FLAC):
+            if audio_file.pictures:
+                return audio_file.pictures[0].data
+        elif isinstance(audio_file, MP4):
+            if 'covr' in audio_file:
+                return audio_file['covr'][0]
+        return None
+
     def _get_tag(self, audio_file, tag_names):
         for tag_name in tag_names:
             if tag_name in audio_file:
@@ -733,16 +2532,13 @@ class LocalMusicPlayer:
         self.stop()
 
         try:
-            self.process = subprocess.Popen([
-                'ffplay', '-nodisp', '-autoexit', '-volume', str(int(self.volume * 100)),
-                str(self.current_file)
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.process = self.spawn_playback()
 
             self.is_playing = True
             self.is_paused = False
             self.position = 0
 
-            metadata = self.extract_metadata(self.current_file)
+            metadata = self.load_metadata(self.current_file)
             self.duration = metadata['duration']
 
             if self.callback:
@@ -752,25 +2548,60 @@ class LocalMusicPlayer:
             return True
 
         except FileNotFoundError:
-            print("ffplay not found. Install with: sudo apt install ffmpeg")
+            print("ffplay/ffmpeg not found. Install with: sudo apt install ffmpeg")
             return False
         except Exception as e:
             print(f"Error playing file: {e}")
             return False
 
+    def spawn_playback(self, position=0):
+        volume = str(int(self.volume * 100))
+        if not self.spectrum:
+            return subprocess.Popen([
+                'ffplay', '-nodisp', '-autoexit', '-volume', volume,
+                '-ss', str(position),
+                str(self.current_file)
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        decoder = subprocess.Popen([
+            'ffmpeg', '-nostdin', '-loglevel', 'quiet',
+            '-ss', str(position), '-i', str(self.current_file),
+            '-vn', '-f', 'wav', '-acodec', 'pcm_s16le', '-ac', '2', '-ar', str(self.spectrum.sample_rate), '-'
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+        try:
+            player = subprocess.Popen([
+                'ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', '-volume', volume, '-i', '-'
+            ], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, bufsize=0)
+        except Exception:
+            decoder.kill()
+            raise
+
+        self.spectrum.reset()
+        self.tap = PlaybackTap(decoder, player, self.spectrum, position)
+        return player
+
+    def stop_tap(self):
+        if self.tap:
+            self.tap.stop()
+            self.tap = None
+
     def stop(self):
         if self.process:
             self.process.terminate()
             self.process = None
+        self.stop_tap()
         self.is_playing = False
         self.is_paused = False
         self.position = 0
 
     def pause(self):
         if self.is_playing and not self.is_paused:
+            if self.tap:
+                self.position = self.tap.position()
             if self.process:
                 self.process.terminate()
                 self.process = None
+            self.stop_tap()
             self.is_paused = True
             print(f"Paused at {self.position:.1f}s")
             return True
@@ -783,14 +2614,11 @@ class LocalMusicPlayer:
             return False
 
         try:
-            self.process = subprocess.Popen([
-                'ffplay', '-nodisp', '-autoexit', '-volume', str(int(self.volume * 100)),
-                '-ss', str(self.position),
-                str(self.current_file)
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.process = self.spawn_playback(self.position)
 
             self.is_playing = True
             self.is_paused = False
+
             print(f"Resumed from {self.position:.1f}s")
             return True
 
@@ -800,7 +2628,10 @@ class LocalMusicPlayer:
 
     def update_position(self):
         if self.is_playing and not self.is_paused and self.process and self.process.poll() is None:
-            self.position += 0.1
+            if self.tap:
+                self.position = self.tap.position()
+            else:
+                self.position += 0.1
             if self.duration > 0 and self.position >= self.duration:
                 self.next_track()
 
@@ -808,19 +2639,37 @@ class LocalMusicPlayer:
         if not self.playlist:
             return False
 
+        next_index = self.peek_next_index()
+        if next_index is None:
+            return False
+
+        self.shuffle_next_index = None
+        self.current_index = next_index
+        return self.play_file()
+
+    def peek_next_index(self):
+        if not self.playlist:
+            return None
+
         if self.play_order == "shuffle":
-            self.current_index = random.randint(0, len(self.playlist) - 1)
+            if self.shuffle_next_index is None or self.shuffle_next_index >= len(self.playlist):
+                self.shuffle_next_index = random.randint(0, len(self.playlist) - 1)
+            return self.shuffle_next_index
         elif self.play_order == "repeat_one":
-            pass
-        else:
-            self.current_index += 1
-            if self.current_index >= len(self.playlist):
-                if self.play_order == "repeat_all":
-                    self.current_index = 0
-                else:
-                    return False
+            return self.current_index
 
-        return self.play_file()
+        next_index = self.current_index + 1
+        if next_index >= len(self.playlist):
+            if self.play_order == "repeat_all":
+                return 0
+            return None
+        return next_index
+
+    def peek_next_file(self):
+        next_index = self.peek_next_index()
+        if next_index is None:
+            return None
+        return self.playlist[next_index]
 
     def previous_track(self):
         if not self.playlist:
@@ -836,7 +2685,7 @@ class LocalMusicPlayer:
         self.volume = max(0.0, min(1.0, volume))
 
         if self.is_playing and not self.is_paused and self.process:
-            current_pos = self.position
+            current_pos = self.tap.position() if self.tap else self.position
             self.stop()
             self.position = current_pos
             if self.current_file:
@@ -844,31 +2693,39 @@ class LocalMusicPlayer:
 
         return True
 
+    def load_metadata(self, file_path):
+        key = str(file_path)
+        with self.metadata_lock:
+            metadata = self.metadata_cache.get(key)
+            if metadata is not None:
+                self.metadata_cache.move_to_end(key)
+                return metadata
+
+        metadata = self.extract_metadata(file_path)
+        metadata['art_url'] = ""
+        if metadata['art_data']:
+            embedded = EmbeddedArtwork.shared()
+            digest = self.artwork_index.cover_for(file_path) or EmbeddedArtwork.digest(metadata['art_data'])
+            metadata['art_url'] = embedded.register(metadata['art_data'], digest)
+            metadata['art_data'] = embedded.get(metadata['art_url'])
+
+        with self.metadata_lock:
+            self.metadata_cache[key] = metadata
+            while len(self.metadata_cache) > 4:
+                self.metadata_cache.popitem(last=False)
+        return metadata
+
     def get_current_info(self):
         if not self.current_file:
             return None
 
-        metadata = self.extract_metadata(self.current_file)
-
-        art_url = ""
-        if metadata['art_data']:
-            art_hash = hashlib.md5(metadata['art_data']).hexdigest()
-            if not hasattr(self, '_cached_art_hash') or self._cached_art_hash != art_hash:
-                try:
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-                    temp_file.write(metadata['art_data'])
-                    temp_file.close()
-                    self._cached_art_url = f"file://{temp_file.name}"
-                    self._cached_art_hash = art_hash
-                except:
-                    pass
-            art_url = getattr(self, '_cached_art_url', "")
+        metadata = self.load_metadata(self.current_file)
 
         return {
             'title': metadata['title'],
             'artist': metadata['artist'],
             'album': metadata['album'],
-            'art_url': art_url,
+            'art_url': metadata['art_url'],
             'status': 'Playing' if self.is_playing and not self.is_paused else 'Paused',
             'length': int(metadata['duration']),
             'position': int(self.position),
@@ -889,13 +2746,32 @@ class Ecliptic(Gtk.Window):
         self.current_color_scheme = None
         self.last_art_url = ""
         self.background_surface = None
+        self.artwork_fetcher = ArtworkFetcher(
+            max_per_host=self.config.artwork_fetch_per_host,
+            deadline=self.config.artwork_fetch_deadline,
+            max_bytes=self.config.artwork_max_download_mb * 1024 * 1024
+        )
+        self.artwork = ArtworkPipeline(cache=self.create_artwork_cache(), fetcher=self.artwork_fetcher)
+        self.artwork_memory = ArtworkMemoryCache(self.config.artwork_memory_cache_mb * 1024 * 1024)
+        self.artwork_loader = ArtworkLoader(
+            self.artwork,
+            workers=self.config.artwork_workers,
+            memory_cache=self.artwork_memory
+        )
+        self.prefetcher = TrackPrefetcher(self.artwork, self.artwork_memory)
         self.is_seeking = False
         self.has_music_playing = False
         self.local_player = LocalMusicPlayer(callback=self.on_local_track_change)
         self.local_mode = False
         self.visualizer = None
         if self.config.visualizer_enabled:
-            self.visualizer = CavaVisualizer(callback=self.on_visualizer_data)
+            self.visualizer = CavaVisualizer(
+                peak_hold=self.config.visualizer_peak_hold,
+                auto_gain=self.config.visualizer_auto_gain,
+                gravity=self.config.visualizer_gravity
+            )
+            if self.config.visualizer_local_spectrum:
+                self.setup_local_spectrum()
 
         self.setup_window()
         self.setup_default_theme()
@@ -904,28 +2780,50 @@ class Ecliptic(Gtk.Window):
         GLib.timeout_add(100, self.update_display)
 
         self.connect("destroy", self.on_destroy)
+        self.connect("notify::scale-factor", self.on_scale_factor_changed)
 
         print("Ecliptic Music Player started")
 
-    def on_visualizer_data(self, points):
+    def create_artwork_cache(self):
+        if not self.config.artwork_cache_enabled:
+            return None
+        try:
+            return ArtworkCache(max_bytes=self.config.artwork_cache_max_mb * 1024 * 1024)
+        except OSError as e:
+            print(f"Artwork cache disabled: {e}")
+            return None
+
+    def setup_local_spectrum(self):
+        mailbox = self.visualizer.mailbox if self.visualizer else None
+        self.local_player.spectrum = SpectrumAnalyzer(
+            mailbox=mailbox,
+            peak_hold=self.config.visualizer_peak_hold,
+            gravity=self.config.visualizer_gravity
+        )
         if hasattr(self, 'visualizer_widget') and self.visualizer_widget:
-            self.visualizer_widget.set_points(points)
-        return False
+            self.visualizer_widget.attach_mailbox(self.local_player.spectrum.mailbox)
+        print("Built-in spectrum analyzer enabled for local playback")
 
     def on_local_track_change(self, metadata):
-        if metadata.get('art_data'):
-            try:
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-                temp_file.write(metadata['art_data'])
-                temp_file.close()
-                art_url = f"file://{temp_file.name}"
-                self.load_album_art_from_url(art_url)
-            except Exception as e:
-                print(f"Error loading local album art: {e}")
+        self.schedule_prefetch()
+        if metadata.get('art_url'):
+            self.load_album_art_from_url(metadata['art_url'])
 
     def on_destroy(self, widget):
         if self.visualizer:
-            self.visualizer.stop()
+            self.visualizer.shutdown()
+            self.visualizer.stop_recording()
+        self.local_player.stop()
+        for bus_name, stats in self.media_controller.latency_stats().items():
+            print(f"D-Bus {bus_name.split('.')[-1]}: {stats['calls']} calls, avg {stats['avg_ms']:.1f} ms, "
+                  f"max {stats['max_ms']:.1f} ms, {stats['timeouts']} timeouts")
+        stats = self.artwork_loader.stats()
+        print(f"Artwork loader: {stats['completed']} applied, {stats['cancelled']} cancelled, "
+              f"{stats['queue_depth']} queued")
+        if hasattr(self, 'visualizer_widget') and self.visualizer_widget.rasterizer:
+            stats = self.visualizer_widget.render_stats()
+            print(f"Visualizer rendering: {stats['rendered']} frames, {stats['skipped']} skipped, "
+                  f"render {stats['render_ms']:.2f} ms, blit {stats['blit_ms']:.2f} ms")
         Gtk.main_quit()
 
     def on_folder_clicked(self, button):
@@ -1149,86 +3047,39 @@ class Ecliptic(Gtk.Window):
 
         return False
 
-    def create_clean_background(self, art_url):
-        if not art_url:
-            return None
-
-        try:
-            image_data = None
-
-            if art_url.startswith('file://'):
-                file_path = art_url[7:]
-                if os.path.exists(file_path):
-                    with open(file_path, 'rb') as f:
-                        image_data = f.read()
-                else:
-                    return None
-            elif art_url.startswith(('http://', 'https://')):
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.get(art_url, timeout=10, headers=headers)
-                response.raise_for_status()
-                image_data = response.content
-            else:
-                if os.path.exists(art_url):
-                    with open(art_url, 'rb') as f:
-                        image_data = f.read()
-                else:
-                    return None
-
-            if not image_data:
-                return None
-
-            pil_image = Image.open(io.BytesIO(image_data))
-
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-
-            target_width, target_height = 520, 810
-
-            img_ratio = pil_image.width / pil_image.height
-            target_ratio = target_width / target_height
-
-            if img_ratio > target_ratio:
-                new_height = pil_image.height
-                new_width = int(new_height * target_ratio)
-                left = (pil_image.width - new_width) // 2
-                pil_image = pil_image.crop((left, 0, left + new_width, new_height))
-            else:
-                new_width = pil_image.width
-                new_height = int(new_width / target_ratio)
-                top = (pil_image.height - new_height) // 3
-                pil_image = pil_image.crop((0, top, new_width, top + new_height))
-
-            pil_image = pil_image.resize((target_width, target_height), Image.LANCZOS)
-
-            pil_image = pil_image.filter(ImageFilter.GaussianBlur(radius=15))
-
-            enhancer = ImageEnhance.Brightness(pil_image)
-            pil_image = enhancer.enhance(0.7)
-
-            width, height = pil_image.size
-            surface = cairo.ImageSurface(cairo.FORMAT_RGB24, width, height)
+    def artwork_options(self):
+        return {
+            'with_palette': self.config.colors_from_album_cover,
+            'scale': max(1, self.get_scale_factor()),
+            'extra_sizes': tuple(self.config.artwork_extra_sizes)
+        }
 
-            img_array = np.array(pil_image)
+    def on_scale_factor_changed(self, widget, param):
+        art_url = self.last_art_url
+        if art_url:
+            self.last_art_url = ""
+            self.load_album_art_from_url(art_url)
 
-            buf = surface.get_data()
-            buf_array = np.ndarray(shape=(height, width, 4), dtype=np.uint8, buffer=buf)
+    def schedule_prefetch(self):
+        if self.config.prefetch_next_track:
+            GLib.idle_add(self.prefetch_upcoming_track, priority=GLib.PRIORITY_LOW)
 
-            buf_array[:, :, 0] = img_array[:, :, 2]
-            buf_array[:, :, 1] = img_array[:, :, 1]
-            buf_array[:, :, 2] = img_array[:, :, 0]
-            buf_array[:, :, 3] = 255
+    def prefetch_upcoming_track(self):
+        options = self.artwork_options()
 
-            surface.mark_dirty()
+        if self.local_mode and self.local_player.current_file:
+            next_file = self.local_player.peek_next_file()
+            if next_file:
+                self.prefetcher.request(lambda: self.local_player.load_metadata(next_file)['art_url'], **options)
+        else:
+            def on_next_track(next_track):
+                art_url = next_track['art_url']
+                if art_url:
+                    self.prefetcher.request(lambda: art_url, **options)
 
-            print(f"Created background surface: {width}x{height}")
-            return surface
+            self.media_controller.request_next_track_info(on_next_track)
 
-        except Exception as e:
-            print(f"Error creating background: {e}")
-            return None
+        return False
 
     def load_album_art_from_url(self, art_url):
         if not art_url or art_url == self.last_art_url:
@@ -1236,66 +3087,35 @@ class Ecliptic(Gtk.Window):
 
         self.last_art_url = art_url
 
-        def load_art_thread():
-            try:
-                image_data = None
-
-                if art_url.startswith('file://'):
-                    file_path = art_url[7:]
-                    if os.path.exists(file_path):
-                        with open(file_path, 'rb') as f:
-                            image_data = f.read()
-                    else:
-                        print(f"Local file not found: {file_path}")
-                        GLib.idle_add(self.create_demo_album_art)
-                        return
-                elif art_url.startswith(('http://', 'https://')):
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    }
-                    response = requests.get(art_url, timeout=10, headers=headers)
-                    response.raise_for_status()
-                    image_data = response.content
-                else:
-                    if os.path.exists(art_url):
-                        with open(art_url, 'rb') as f:
-                            image_data = f.read()
-                    else:
-                        print(f"Unsupported URL format or file not found: {art_url}")
-                        GLib.idle_add(self.create_demo_album_art)
-                        return
-
-                if not image_data:
-                    print(f"No image data loaded from: {art_url}")
-                    GLib.idle_add(self.create_demo_album_art)
-                    return
-
-                loader = GdkPixbuf.PixbufLoader()
-                loader.write(image_data)
-                loader.close()
-
-                pixbuf = loader.get_pixbuf()
-
-                scaled_pixbuf = pixbuf.scale_simple(400, 400, GdkPixbuf.InterpType.BILINEAR)
-
-                background_surface = self.create_clean_background(art_url)
+        options = self.artwork_options()
+        artwork = self.artwork_memory.get(ArtworkPipeline.rendition_key(art_url, **options))
+        if artwork:
+            self.artwork_loader.cancel()
+            self.update_album_art_ui(artwork['pixbuf'], artwork['background'], artwork['color_scheme'],
+                                     artwork['scale'])
+            return
 
-                if self.config.colors_from_album_cover:
-                    color_data = io.BytesIO(image_data)
-                    dominant_colors = ColorExtractor.get_dominant_colors(color_data)
-                    color_scheme = ColorExtractor.generate_color_scheme(dominant_colors)
-                    GLib.idle_add(self.apply_color_scheme, color_scheme)
+        def on_artwork_loaded(artwork):
+            if not artwork:
+                self.create_demo_album_art()
+                return
+            self.update_album_art_ui(artwork['pixbuf'], artwork['background'], artwork['color_scheme'],
+                                     artwork['scale'])
 
-                GLib.idle_add(self.update_album_art_ui, scaled_pixbuf, background_surface)
+        def on_artwork_failed(error):
+            print(f"Error loading album art: {error}")
+            self.create_demo_album_art()
 
-            except Exception as e:
-                print(f"Error loading album art: {e}")
-                GLib.idle_add(self.create_demo_album_art)
+        self.artwork_loader.submit(art_url, on_artwork_loaded, on_artwork_failed, **options)
 
-        threading.Thread(target=load_art_thread, daemon=True).start()
+    def update_album_art_ui(self, pixbuf, background_surface, color_scheme=None, scale=1):
+        if color_scheme:
+            self.apply_color_scheme(color_scheme)
 
-    def update_album_art_ui(self, pixbuf, background_surface):
-        self.album_art.set_from_pixbuf(pixbuf)
+        if scale > 1:
+            self.album_art.set_from_surface(Gdk.cairo_surface_create_from_pixbuf(pixbuf, scale, self.get_window()))
+        else:
+            self.album_art.set_from_pixbuf(pixbuf)
 
         self.background_surface = background_surface
         if hasattr(self, 'background_area'):
@@ -1321,6 +3141,7 @@ class Ecliptic(Gtk.Window):
         if hasattr(self, 'visualizer_widget') and self.visualizer_widget:
             accent_color = color_scheme.get('accent', (0.4, 0.5, 0.9))
             self.visualizer_widget.set_color(*accent_color, 0.6)
+            self.visualizer_widget.set_color_scheme(color_scheme)
 
         def rgb_to_css(rgb):
             return f"rgb({int(rgb[0]*255)}, {int(rgb[1]*255)}, {int(rgb[2]*255)})"
@@ -1523,8 +3344,14 @@ class Ecliptic(Gtk.Window):
             visualizer_frame.get_style_context().add_class("visualizer-container")
             visualizer_frame.set_shadow_type(Gtk.ShadowType.NONE)
 
-            self.visualizer_widget = VisualizerWidget()
+            self.visualizer_widget = VisualizerWidget(
+                threaded=self.config.visualizer_threaded_render,
+                style=self.config.visualizer_style
+            )
+            self.visualizer_widget.set_color_scheme(self.current_color_scheme)
             self.visualizer_widget.set_size_request(400, 80)
+            if self.visualizer:
+                self.visualizer_widget.attach_mailbox(self.visualizer.mailbox)
             visualizer_frame.add(self.visualizer_widget)
 
             visualizer_container = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
@@ -1658,19 +3485,13 @@ class Ecliptic(Gtk.Window):
                 print("Local shuffle enabled")
             return
 
-        if not self.media_controller.bus or not self.media_controller.current_player or self.media_controller.current_player not in self.media_controller.players:
+        track_info = self.media_controller.get_current_track_info()
+        if not track_info:
             return
 
         try:
-            player = self.media_controller.players[self.media_controller.current_player]
-            props = dbus.Interface(player, 'org.freedesktop.DBus.Properties')
-
-            current_shuffle = self.media_controller.safe_dbus_call(props.Get, 'org.mpris.MediaPlayer2.Player', 'Shuffle')
-            new_shuffle = not bool(current_shuffle) if current_shuffle is not None else True
-
-            result = self.media_controller.safe_dbus_call(props.Set, 'org.mpris.MediaPlayer2.Player', 'Shuffle', dbus.Boolean(new_shuffle))
-
-            if result is not None:
+            new_shuffle = not track_info['shuffle']
+            if self.media_controller.set_player_property('Shuffle', dbus.Boolean(new_shuffle)):
                 print(f"Shuffle {'enabled' if new_shuffle else 'disabled'}")
             else:
                 print("Shuffle toggle failed")
@@ -1691,15 +3512,12 @@ class Ecliptic(Gtk.Window):
                 print("Local repeat: Off")
             return
 
-        if not self.media_controller.bus or not self.media_controller.current_player or self.media_controller.current_player not in self.media_controller.players:
+        track_info = self.media_controller.get_current_track_info()
+        if not track_info:
             return
 
         try:
-            player = self.media_controller.players[self.media_controller.current_player]
-            props = dbus.Interface(player, 'org.freedesktop.DBus.Properties')
-
-            current_loop = self.media_controller.safe_dbus_call(props.Get, 'org.mpris.MediaPlayer2.Player', 'LoopStatus')
-            current_loop = str(current_loop) if current_loop else 'None'
+            current_loop = track_info['loop_status']
 
             if current_loop == 'None':
                 new_loop = 'Track'
@@ -1708,9 +3526,7 @@ class Ecliptic(Gtk.Window):
             else:
                 new_loop = 'None'
 
-            result = self.media_controller.safe_dbus_call(props.Set, 'org.mpris.MediaPlayer2.Player', 'LoopStatus', dbus.String(new_loop))
-
-            if result is not None:
+            if self.media_controller.set_player_property('LoopStatus', dbus.String(new_loop)):
                 print(f"Repeat mode: {new_loop}")
             else:
                 print("Repeat toggle failed")
@@ -1783,12 +3599,21 @@ class Ecliptic(Gtk.Window):
         if track_info:
             self.has_music_playing = track_info['status'] in ['Playing', 'Paused']
 
+            use_cava = not (self.local_mode and self.local_player.spectrum)
             if self.visualizer and self.config.visualizer_enabled:
-                if track_info['status'] == 'Playing' and not self.visualizer.running:
+                if not use_cava and self.visualizer.running:
+                    self.visualizer.stop()
+                elif use_cava and track_info['status'] == 'Playing' and not self.visualizer.running:
                     self.visualizer.start()
                 elif track_info['status'] != 'Playing' and self.visualizer.running:
                     self.visualizer.stop()
 
+            if not self.local_mode:
+                track = (track_info['track_id'], track_info['title'], track_info['artist'], track_info['album'])
+                if track != self.current_track:
+                    self.current_track = track
+                    self.schedule_prefetch()
+
             if track_info.get('art_url') and track_info['art_url'] != self.last_art_url:
                 print(f"Loading new album art: {track_info['art_url']}")
                 self.load_album_art_from_url(track_info['art_url'])
@@ -1865,6 +3690,14 @@ class Ecliptic(Gtk.Window):
 def main():
     parser = argparse.ArgumentParser(description='Ecliptic Music Player with Cava Visualizer')
     parser.add_argument('--no-visualizer', action='store_true', help='Disable audio visualizer')
+    parser.add_argument('--local-spectrum', action='store_true',
+                        help='Analyze local files in-process instead of running cava')
+    parser.add_argument('--threaded-visualizer', action='store_true',
+                        help='Rasterize the visualizer on a worker thread')
+    parser.add_argument('--record-cava', metavar='PATH',
+                        help='Record the raw cava stream for benchmarks/replay_visualizer.py')
+    parser.add_argument('--visualizer-style', choices=['wave', 'spectrogram'], default='wave',
+                        help='Visualizer style (default: wave)')
 
     args = parser.parse_args()
 
@@ -1882,9 +3715,24 @@ def main():
     if args.no_visualizer:
         app.config.visualizer_enabled = False
         if app.visualizer:
-            app.visualizer.stop()
+            app.visualizer.shutdown()
             app.visualizer = None
+        app.local_player.spectrum = None
         print("Audio visualizer disabled")
+    elif args.local_spectrum and not app.local_player.spectrum:
+        app.config.visualizer_local_spectrum = True
+        app.setup_local_spectrum()
+
+    if args.threaded_visualizer and hasattr(app, 'visualizer_widget'):
+        app.config.visualizer_threaded_render = True
+        app.visualizer_widget.set_threaded(True)
+
+    if args.record_cava and app.visualizer:
+        app.visualizer.start_recording(args.record_cava)
+
+    if args.visualizer_style != app.config.visualizer_style and hasattr(app, 'visualizer_widget'):
+        app.config.visualizer_style = args.visualizer_style
+        app.visualizer_widget.set_style(args.visualizer_style)
 
     app.connect("destroy", Gtk.main_quit)
     app.show_all()
@@ -1931,6 +3779,9 @@ def main():
     print("Available modes:")
     print("   python3 ecliptic.py                       # Full player window (default)")
     print("   python3 ecliptic.py --no-visualizer       # Disable audio visualizer")
+    print("   python3 ecliptic.py --local-spectrum      # Built-in analyzer for local files")
+    print("   python3 ecliptic.py --threaded-visualizer # Render visualizer off the main thread")
+    print("   python3 ecliptic.py --visualizer-style spectrogram  # Scrolling spectrogram")
     print("")
     print("Required dependencies:")
     print("   pip install pillow requests numpy dbus-python")
@@ -1955,7 +3806,8 @@ def main():
         print("Ecliptic Music Player with Visualizer stopped by user")
     finally:
         if hasattr(app, 'visualizer') and app.visualizer:
-            app.visualizer.stop()
+            app.visualizer.shutdown()
+            app.visualizer.stop_recording()
 
 if __name__ == "__main__":
     main()